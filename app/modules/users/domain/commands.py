@@ -12,3 +12,20 @@ class CreateUserRequest(Request):
 @dataclass(frozen=True, kw_only=True)
 class CreateUserResponse(Response):
     id: int
+
+
+@dataclass(frozen=True, kw_only=True)
+class NewUser:
+    email: str
+    name: str
+
+
+@dataclass(frozen=True, kw_only=True)
+class CreateUsersBatchRequest(Request):
+    users: list[NewUser]
+
+
+@dataclass(frozen=True, kw_only=True)
+class CreateUsersBatchResponse(Response):
+    # ids in the order of requested users, None if user is already registered
+    ids: list[int | None]
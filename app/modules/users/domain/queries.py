@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 
 from app.modules.users.domain.models import User
@@ -9,9 +10,34 @@ class GetUsersQuery(Request):
     search_query: str | None = field(default=None)
     limit: int = field(default=25)
     offset: int = field(default=0)
+    with_count: bool = field(default=True)
+    after_id: int | None = field(default=None)
 
 
 @dataclass(frozen=True, kw_only=True)
 class GetUsersQueryResult(Response):
-    count: int
+    count: int | None
     data: list[User]
+    next_after_id: int | None = field(default=None)
+
+
+@dataclass(frozen=True, kw_only=True)
+class GetUsersByIdsQuery(Request):
+    user_ids: list[int]
+
+
+@dataclass(frozen=True, kw_only=True)
+class GetUsersByIdsQueryResult(Response):
+    # found users in the order of requested ids
+    data: list[User]
+
+
+@dataclass(frozen=True, kw_only=True)
+class ExportUsersQuery(Request):
+    search_query: str | None = field(default=None)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ExportUsersQueryResult(Response):
+    # lazily reads users from the repository while it is consumed
+    users: AsyncIterator[User]
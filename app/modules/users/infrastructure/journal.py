@@ -0,0 +1,176 @@
+import logging
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.modules.users.infrastructure.storage import AbstractUsersStorage
+
+logger = logging.getLogger(__name__)
+
+# user id, email length, name length followed by utf-8 encoded email and name
+RECORD_HEADER = struct.Struct("<qII")
+SNAPSHOT_MAGIC = b"USRSNAP1"
+
+
+class UsersJournal:
+    """Durability for the in-memory users storage.
+
+    Every created user is appended to a binary log. Once the log grows over
+    ``snapshot_every`` records it is rotated and the storage is compacted into a
+    snapshot in a background thread, after that the rotated log is removed. On
+    startup the snapshot is memory-mapped and loaded, then the tails of the rotated
+    and the current logs are replayed. Records with ids already loaded are skipped,
+    so a crash at any step of the compaction loses nothing. The search index is
+    rebuilt in background after that.
+
+    Usage::
+
+      storage = UsersStorage()
+      journal = UsersJournal(Path("data/users"))
+      journal.recover(storage)
+      storage.journal = journal
+
+    """
+
+    def __init__(
+        self, directory: Path, snapshot_every: int = 100_000, fsync: bool = False
+    ) -> None:
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+
+        self.snapshot_path = directory / "users.snapshot"
+        self.log_path = directory / "users.log"
+        self.rotated_log_path = directory / "users.log.1"
+
+        self._storage: "AbstractUsersStorage | None" = None
+        self._log = None
+        self._log_records = 0
+        self._compaction: threading.Thread | None = None
+
+    def recover(self, storage: "AbstractUsersStorage") -> None:
+        """Load users into the storage and open the log for appending."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._storage = storage
+
+        for user_id, email, name in self._read(self.snapshot_path, SNAPSHOT_MAGIC):
+            storage.restore(user_id, email, name)
+        snapshot_size = len(storage)
+
+        for path in (self.rotated_log_path, self.log_path):
+            for user_id, email, name in self._read(path):
+                if user_id > storage.last_id:
+                    storage.restore(user_id, email, name)
+                    self._log_records += 1
+        storage.rebuild_search_index()
+
+        logger.info(
+            "%d users recovered, %d from the snapshot and %d from the logs",
+            len(storage),
+            snapshot_size,
+            self._log_records,
+        )
+
+        if self.rotated_log_path.exists() or self._log_records >= self.snapshot_every:
+            # previous compaction didn't finish or the log is too long to replay next time
+            self._write_snapshot(len(storage))
+            self.log_path.unlink(missing_ok=True)
+            self._log_records = 0
+        self._log = open(self.log_path, "ab", buffering=0)
+
+    def append(self, user_id: int, email: str, name: str) -> None:
+        """Write created user to the log, the call returns after the write syscall."""
+        if self._log_records >= self.snapshot_every and self._can_compact:
+            self._rotate()
+            self._compaction = threading.Thread(
+                target=self._write_snapshot,
+                args=(len(self._storage),),
+                name="users-snapshot",
+                daemon=True,
+            )
+            self._compaction.start()
+
+        email_bytes = email.encode()
+        name_bytes = name.encode()
+        self._log.write(
+            RECORD_HEADER.pack(user_id, len(email_bytes), len(name_bytes))
+            + email_bytes
+            + name_bytes
+        )
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self._log_records += 1
+
+    def close(self) -> None:
+        if self._compaction is not None:
+            self._compaction.join()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    @property
+    def _can_compact(self) -> bool:
+        if self._compaction is not None and self._compaction.is_alive():
+            return False
+        # the rotated log is left only if the last compaction failed, keep it intact
+        return not self.rotated_log_path.exists()
+
+    def _rotate(self) -> None:
+        if self._log is not None:
+            self._log.close()
+        if self.log_path.exists():
+            os.replace(self.log_path, self.rotated_log_path)
+        self._log = open(self.log_path, "ab", buffering=0)
+        self._log_records = 0
+
+    def _write_snapshot(self, rows: int) -> None:
+        """Write the first rows of the storage to the snapshot and drop the rotated log.
+
+        The storage is append-only, so the rows can be read while new users are added.
+        """
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as snapshot:
+            snapshot.write(SNAPSHOT_MAGIC)
+            for user in islice(self._storage.search(), rows):
+                email_bytes = user.email.encode()
+                name_bytes = user.name.encode()
+                snapshot.write(RECORD_HEADER.pack(user.id, len(email_bytes), len(name_bytes)))
+                snapshot.write(email_bytes)
+                snapshot.write(name_bytes)
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self.rotated_log_path.unlink(missing_ok=True)
+        logger.info("Users snapshot with %d users written", rows)
+
+    @staticmethod
+    def _read(path: Path, magic: bytes = b"") -> Iterator[tuple[int, str, str]]:
+        if not path.exists() or path.stat().st_size <= len(magic):
+            return
+
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(magic)] != magic:
+                raise ValueError(f"{path} is not a users snapshot")
+
+            pos = len(magic)
+            end = len(data)
+            while pos + RECORD_HEADER.size <= end:
+                user_id, email_size, name_size = RECORD_HEADER.unpack_from(data, pos)
+                email_start = pos + RECORD_HEADER.size
+                name_start = email_start + email_size
+                if name_start + name_size > end:
+                    break
+                pos = name_start + name_size
+                yield user_id, data[email_start:name_start].decode(), data[name_start:pos].decode()
+
+        if pos != end:
+            # the process died in the middle of a write, drop the torn record,
+            # so new records are appended right after the last complete one
+            logger.warning("Truncated record at the end of %s is dropped", path)
+            os.truncate(path, pos)
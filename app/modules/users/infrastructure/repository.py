@@ -1,12 +1,19 @@
 import abc
+import asyncio
 import logging
+from collections.abc import AsyncIterator, Sequence
+from itertools import islice
 
 from app.modules.users.domain.models import User
 from app.modules.users.infrastructure.errors import DuplicateKeyError
+from app.modules.users.infrastructure.storage import AbstractUsersStorage
 
 logger = logging.getLogger(__name__)
 
-USERS_STORAGE: list[User] = []
+
+def normalize_email(email: str) -> str:
+    """Return the email as stored, emails differing in case are the same."""
+    return email.strip().lower()
 
 
 class AbstractUserRepository(abc.ABC):
@@ -14,6 +21,14 @@ class AbstractUserRepository(abc.ABC):
     async def create(self, email: str, name: str) -> int:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def create_many(self, users: Sequence[tuple[str, str]]) -> list[int | None]:
+        """Create users from (email, name) pairs in one pass.
+
+        Return ids in the same order, None for users whose email is already taken.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def get_list(
         self, search_query: str | None = None, limit: int = 25, offset: int = 0
@@ -24,32 +39,112 @@ class AbstractUserRepository(abc.ABC):
     async def get_count(self, search_query: str | None) -> int:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def get_many(self, user_ids: Sequence[int]) -> dict[int, User]:
+        """Return found users by their ids in one call."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iter_users(
+        self, search_query: str | None = None, chunk_size: int = 1000
+    ) -> AsyncIterator[User]:
+        """Iterate over all matched users in id order.
+
+        Users are read by chunks, so memory usage does not depend on the number of users.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_page(
+        self,
+        search_query: str | None = None,
+        limit: int = 25,
+        offset: int = 0,
+        with_count: bool = True,
+        after_id: int | None = None,
+    ) -> tuple[list[User], int | None]:
+        """Return users page and total count of matched users evaluated at once.
+
+        Count is None when with_count is False, which lets the repository stop
+        as soon as the page is filled. When after_id is passed the page starts right
+        after the user with this id (keyset pagination), offset is applied after it.
+        """
+        raise NotImplementedError
+
 
 class InMemoryUserRepository(AbstractUserRepository):
-    async def create(self, email: str, name: str) -> int:
-        email = email.strip().lower()
-        for user in USERS_STORAGE:
-            if user.email == email:
-                raise DuplicateKeyError()
-        user_ids = [0] + [user.id for user in USERS_STORAGE]
-        new_id = max(user_ids) + 1
+    def __init__(self, storage: AbstractUsersStorage):
+        self.storage = storage
 
-        user = User(id=new_id, email=email, name=name)
-        USERS_STORAGE.append(user)
+    async def create(self, email: str, name: str) -> int:
+        email = normalize_email(email)
+        user = self.storage.add(email, name)
 
         logger.info("User %s saved", user)
-        return new_id
+        return user.id
+
+    async def create_many(self, users: Sequence[tuple[str, str]]) -> list[int | None]:
+        ids = []
+        for email, name in users:
+            try:
+                ids.append(self.storage.add(normalize_email(email), name).id)
+            except DuplicateKeyError:
+                ids.append(None)
+
+        logger.info("%d of %d users saved", len(ids) - ids.count(None), len(ids))
+        return ids
 
     async def get_list(
         self, search_query: str | None = None, limit: int = 25, offset: int = 0
     ) -> list[User]:
-        users = USERS_STORAGE
-        if search_query:
-            users = [user for user in users if search_query in user.email or search_query in user.name]
-        return users[offset:limit]
+        users = self.storage.search(search_query)
+        return list(islice(users, offset, offset + limit))
 
     async def get_count(self, search_query: str | None) -> int:
-        users = USERS_STORAGE
-        if search_query:
-            users = [user for user in users if search_query in user.email or search_query in user.name]
-        return len(users)
+        if not search_query:
+            return len(self.storage)
+        return sum(1 for _ in self.storage.search(search_query))
+
+    async def get_many(self, user_ids: Sequence[int]) -> dict[int, User]:
+        users = {}
+        for user_id in user_ids:
+            user = self.storage.get(user_id)
+            if user is not None:
+                users[user_id] = user
+        return users
+
+    async def get_page(
+        self,
+        search_query: str | None = None,
+        limit: int = 25,
+        offset: int = 0,
+        with_count: bool = True,
+        after_id: int | None = None,
+    ) -> tuple[list[User], int | None]:
+        if not with_count or not search_query:
+            users = self.storage.search(search_query, after_id)
+            page = list(islice(users, offset, offset + limit))
+            return page, len(self.storage) if with_count else None
+
+        page = []
+        count = 0
+        skipped = 0
+        for user in self.storage.search(search_query):
+            count += 1
+            if len(page) == limit or (after_id is not None and user.id <= after_id):
+                continue
+            if skipped < offset:
+                skipped += 1
+            else:
+                page.append(user)
+        return page, count
+
+    async def iter_users(
+        self, search_query: str | None = None, chunk_size: int = 1000
+    ) -> AsyncIterator[User]:
+        users = self.storage.search(search_query)
+        while chunk := list(islice(users, chunk_size)):
+            for user in chunk:
+                yield user
+            # let other tasks run between chunks
+            await asyncio.sleep(0)
@@ -0,0 +1,78 @@
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+
+NGRAM_SIZE = 3
+
+
+def ngrams(value: str, size: int = NGRAM_SIZE) -> set[str]:
+    """Return a set of all substrings of the passed size."""
+    return {value[i:i + size] for i in range(len(value) - size + 1)}
+
+
+class NgramIndex:
+    """Incrementally maintained n-gram inverted index.
+
+    Every posting list is an ``array('q')`` of document ids. Ids must be added in
+    ascending order, so posting lists stay sorted and can be probed with bisect.
+
+    The index only narrows the search down to candidates, the caller still has to
+    verify them against the original predicate.
+    """
+
+    def __init__(
+        self, size: int = NGRAM_SIZE, max_selectivity: float = 0.5, enabled: bool = True
+    ) -> None:
+        self.size = size
+        self.max_selectivity = max_selectivity
+        self.enabled = enabled
+        self._postings: dict[str, array] = defaultdict(lambda: array("q"))
+        self._docs_count = 0
+
+    def add(self, doc_id: int, values: Iterable[str]) -> None:
+        if not self.enabled:
+            return
+        self._docs_count += 1
+        doc_ngrams = set()
+        for value in values:
+            doc_ngrams |= ngrams(value, self.size)
+        for ngram in doc_ngrams:
+            self._postings[ngram].append(doc_id)
+
+    def candidates(self, query: str) -> Sequence[int] | None:
+        """Return ids of documents containing every n-gram of the query in ascending order.
+
+        Return None when the index can't help: it is disabled, the query is shorter
+        than an n-gram or even its rarest n-gram occurs in most of the documents, so a
+        plain scan is cheaper.
+        """
+        if not self.enabled or len(query) < self.size:
+            return None
+
+        postings = []
+        for ngram in ngrams(query, self.size):
+            posting = self._postings.get(ngram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        if len(postings[0]) > self._docs_count * self.max_selectivity:
+            return None
+
+        candidates: Sequence[int] = postings[0]
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            # probing a long posting list is cheaper than hashing it
+            if len(candidates) * len(posting).bit_length() < len(posting):
+                candidates = [doc_id for doc_id in candidates if _contains(posting, doc_id)]
+            else:
+                posting_set = set(posting)
+                candidates = [doc_id for doc_id in candidates if doc_id in posting_set]
+        return candidates
+
+
+def _contains(posting: array, doc_id: int) -> bool:
+    idx = bisect_left(posting, doc_id)
+    return idx < len(posting) and posting[idx] == doc_id
@@ -0,0 +1,166 @@
+import json
+import logging
+import sqlite3
+from collections.abc import AsyncIterator, Sequence
+
+from app.modules.users.domain.models import User
+from app.modules.users.infrastructure.errors import DuplicateKeyError
+from app.modules.users.infrastructure.repository import AbstractUserRepository, normalize_email
+from app.seedwork.infrastructure.sqlite import SqlitePool
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_email_idx ON users (email);
+CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+    email, name, content='users', content_rowid='id', tokenize='trigram case_sensitive 1'
+);
+CREATE TRIGGER IF NOT EXISTS users_fts_insert AFTER INSERT ON users BEGIN
+    INSERT INTO users_fts (rowid, email, name) VALUES (new.id, new.email, new.name);
+END;
+"""
+
+INSERT_USER = "INSERT INTO users (email, name) VALUES (?, ?)"
+
+INSERT_USER_IF_NEW = (
+    "INSERT INTO users (email, name) VALUES (?, ?) ON CONFLICT (email) DO NOTHING RETURNING id"
+)
+
+SELECT_PAGE = "SELECT id, email, name FROM users {where} ORDER BY id LIMIT :limit OFFSET :offset"
+
+SELECT_COUNT = "SELECT count(*) FROM users {where}"
+
+# ids are passed as a json array, so the statement is the same for any number of ids
+SELECT_BY_IDS = "SELECT id, email, name FROM users WHERE id IN (SELECT value FROM json_each(?))"
+
+FTS_FILTER = "id IN (SELECT rowid FROM users_fts WHERE users_fts MATCH :fts_query)"
+SCAN_FILTER = "(instr(email, :search_query) > 0 OR instr(name, :search_query) > 0)"
+AFTER_FILTER = "id > :after_id"
+
+
+class SqliteUserRepository(AbstractUserRepository):
+    """Users repository backed by sqlite, so it can be shared between processes.
+
+    Search is served by a trigram FTS5 table kept in sync by a trigger.
+    """
+
+    def __init__(self, pool: SqlitePool):
+        self.pool = pool
+
+    def close(self) -> None:
+        self.pool.close()
+
+    async def create(self, email: str, name: str) -> int:
+        email = normalize_email(email)
+
+        def _insert(conn: sqlite3.Connection) -> int:
+            with conn:
+                return conn.execute(INSERT_USER, (email, name)).lastrowid
+
+        try:
+            user_id = await self.pool.run(_insert)
+        except sqlite3.IntegrityError:
+            raise DuplicateKeyError() from None
+
+        logger.info("User %s saved", User(id=user_id, email=email, name=name))
+        return user_id
+
+    async def create_many(self, users: Sequence[tuple[str, str]]) -> list[int | None]:
+        users = [(normalize_email(email), name) for email, name in users]
+
+        def _insert(conn: sqlite3.Connection) -> list[int | None]:
+            ids = []
+            with conn:
+                for user in users:
+                    row = conn.execute(INSERT_USER_IF_NEW, user).fetchone()
+                    ids.append(row[0] if row else None)
+            return ids
+
+        ids = await self.pool.run(_insert)
+
+        logger.info("%d of %d users saved", len(ids) - ids.count(None), len(ids))
+        return ids
+
+    async def get_list(
+        self, search_query: str | None = None, limit: int = 25, offset: int = 0
+    ) -> list[User]:
+        users, _ = await self.get_page(search_query, limit, offset, with_count=False)
+        return users
+
+    async def get_count(self, search_query: str | None) -> int:
+        sql = SELECT_COUNT.format(where=_where(search_query))
+        params = _search_params(search_query)
+        return await self.pool.run(lambda conn: conn.execute(sql, params).fetchone()[0])
+
+    async def get_many(self, user_ids: Sequence[int]) -> dict[int, User]:
+        if not user_ids:
+            return {}
+        params = (json.dumps(list(user_ids)),)
+        rows = await self.pool.run(lambda conn: conn.execute(SELECT_BY_IDS, params).fetchall())
+        return {row[0]: User(id=row[0], email=row[1], name=row[2]) for row in rows}
+
+    async def iter_users(
+        self, search_query: str | None = None, chunk_size: int = 1000
+    ) -> AsyncIterator[User]:
+        after_id = None
+        while True:
+            users, _ = await self.get_page(
+                search_query, chunk_size, with_count=False, after_id=after_id
+            )
+            for user in users:
+                yield user
+            if len(users) < chunk_size:
+                return
+            after_id = users[-1].id
+
+    async def get_page(
+        self,
+        search_query: str | None = None,
+        limit: int = 25,
+        offset: int = 0,
+        with_count: bool = True,
+        after_id: int | None = None,
+    ) -> tuple[list[User], int | None]:
+        page_sql = SELECT_PAGE.format(where=_where(search_query, after_id))
+        count_sql = SELECT_COUNT.format(where=_where(search_query))
+        params = _search_params(search_query) | {
+            "after_id": after_id,
+            "limit": limit,
+            "offset": offset,
+        }
+
+        def _select(conn: sqlite3.Connection) -> tuple[list[User], int | None]:
+            # read page and count from the same snapshot
+            with conn:
+                conn.execute("BEGIN")
+                rows = conn.execute(page_sql, params).fetchall()
+                count = conn.execute(count_sql, params).fetchone()[0] if with_count else None
+            return [User(id=row[0], email=row[1], name=row[2]) for row in rows], count
+
+        return await self.pool.run(_select)
+
+
+def _where(search_query: str | None, after_id: int | None = None) -> str:
+    """Build WHERE clause, there are only a few variants, so statements stay cached."""
+    filters = []
+    if search_query:
+        # trigram tokenizer can't match queries shorter than 3 characters
+        filters.append(FTS_FILTER if len(search_query) >= 3 else SCAN_FILTER)
+    if after_id is not None:
+        filters.append(AFTER_FILTER)
+    if not filters:
+        return ""
+    return "WHERE " + " AND ".join(filters)
+
+
+def _search_params(search_query: str | None) -> dict[str, str | None]:
+    fts_query = None
+    if search_query:
+        # match the query as a single phrase, so it is a plain substring search
+        fts_query = '"' + search_query.replace('"', '""') + '"'
+    return {"search_query": search_query, "fts_query": fts_query}
@@ -0,0 +1,235 @@
+import abc
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+
+from app.modules.users.domain.models import User
+from app.modules.users.infrastructure.errors import DuplicateKeyError
+from app.modules.users.infrastructure.journal import UsersJournal
+from app.modules.users.infrastructure.search_index import NgramIndex
+
+
+class AbstractUsersStorage(abc.ABC):
+    """In-memory users storage.
+
+    Users are kept in rows in insertion (and therefore id) order, ``ids`` holds the id
+    of every row, so it is sorted and keyset pagination just bisects it. Ids are
+    allocated from a monotonic counter. When a journal is attached every new user is
+    written to it before it is stored. Substring search is served by a trigram index
+    over rows, so only candidates containing every trigram of the query are checked.
+
+    Subclasses define the layout of the rows.
+    """
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.last_id: int = 0
+        self.search_index = NgramIndex()
+        self.journal: UsersJournal | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[User]:
+        return self.search()
+
+    def add(self, email: str, name: str) -> User:
+        if self._find_row(email) is not None:
+            raise DuplicateKeyError()
+        user_id = self.last_id + 1
+        if self.journal is not None:
+            self.journal.append(user_id, email, name)
+        self._insert(user_id, email, name)
+        return User(id=user_id, email=email, name=name)
+
+    def restore(self, user_id: int, email: str, name: str) -> None:
+        """Insert a user loaded from the journal, users must be restored in id order.
+
+        Restored users are not indexed, call rebuild_search_index when restoring is done.
+        """
+        with self._lock:
+            self._append(user_id, email, name)
+            self.ids.append(user_id)
+            self.last_id = user_id
+
+    def rebuild_search_index(self) -> threading.Thread:
+        """Build the search index from scratch in a background thread.
+
+        Indexing is several times slower than storing, so it is not done on startup.
+        Until the new index is ready search falls back to scanning.
+        """
+        with self._lock:
+            self.search_index = NgramIndex(enabled=False)
+        thread = threading.Thread(
+            target=self._build_search_index, name="users-search-index", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def get(self, user_id: int) -> User | None:
+        row = bisect_left(self.ids, user_id)
+        if row == len(self.ids) or self.ids[row] != user_id:
+            return None
+        return self._get_user(row)
+
+    def get_by_email(self, email: str) -> User | None:
+        row = self._find_row(email)
+        if row is None:
+            return None
+        return self._get_user(row)
+
+    def search(
+        self, search_query: str | None = None, after_id: int | None = None
+    ) -> Iterator[User]:
+        """Yield users whose email or name contains the query in id order.
+
+        When after_id is passed only users with greater ids are yielded.
+        """
+        start = 0 if after_id is None else bisect_right(self.ids, after_id)
+
+        candidates = None
+        if search_query:
+            candidates = self.search_index.candidates(search_query)
+        if candidates is None:
+            rows: Iterable[int] = range(start, len(self.ids))
+        else:
+            rows = _tail(candidates, start)
+
+        if not search_query:
+            yield from map(self._get_user, rows)
+            return
+
+        for row in rows:
+            if self._contains(row, search_query):
+                yield self._get_user(row)
+
+    def _insert(self, user_id: int, email: str, name: str) -> None:
+        with self._lock:
+            row = len(self.ids)
+            self._append(user_id, email, name)
+            self.ids.append(user_id)
+            self.search_index.add(row, (email, name))
+            self.last_id = user_id
+
+    def _build_search_index(self) -> None:
+        index = NgramIndex()
+        indexed = 0
+        while True:
+            with self._lock:
+                if indexed == len(self.ids):
+                    # nothing was inserted since the last check, new users go to the new index
+                    self.search_index = index
+                    return
+                rows = range(indexed, len(self.ids))
+            for row in rows:
+                user = self._get_user(row)
+                index.add(row, (user.email, user.name))
+            indexed = rows.stop
+
+    @abc.abstractmethod
+    def _append(self, user_id: int, email: str, name: str) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _find_row(self, email: str) -> int | None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _get_user(self, row: int) -> User:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _contains(self, row: int, search_query: str) -> bool:
+        """Check whether email or name in the row contains the query."""
+        raise NotImplementedError
+
+
+class UsersStorage(AbstractUsersStorage):
+    """Keeps a ``User`` object per row with an id -> User map and an email -> row map."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.users: dict[int, User] = {}
+        self.rows_by_email: dict[str, int] = {}
+
+    def get(self, user_id: int) -> User | None:
+        return self.users.get(user_id)
+
+    def _append(self, user_id: int, email: str, name: str) -> None:
+        self.users[user_id] = User(id=user_id, email=email, name=name)
+        self.rows_by_email[email] = len(self.ids)
+
+    def _find_row(self, email: str) -> int | None:
+        return self.rows_by_email.get(email)
+
+    def _get_user(self, row: int) -> User:
+        return self.users[self.ids[row]]
+
+    def _contains(self, row: int, search_query: str) -> bool:
+        user = self.users[self.ids[row]]
+        return search_query in user.email or search_query in user.name
+
+
+class CompactUsersStorage(AbstractUsersStorage):
+    """Keeps rows in flat buffers instead of a ``User`` object per row.
+
+    Emails and names are utf-8 encoded into offset-indexed buffers and ``User``
+    objects are built only for the rows that are returned. Emails are indexed by
+    their hash, so the index does not keep a second copy of every email, rare hash
+    collisions go to a small overflow map.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.emails = StringColumn()
+        self.names = StringColumn()
+        self._rows_by_email_hash: dict[int, int] = {}
+        self._colliding_rows_by_email: dict[str, int] = {}
+
+    def _append(self, user_id: int, email: str, name: str) -> None:
+        row = len(self.ids)
+        self.emails.append(email)
+        self.names.append(name)
+        email_hash = hash(email)
+        if email_hash in self._rows_by_email_hash:
+            self._colliding_rows_by_email[email] = row
+        else:
+            self._rows_by_email_hash[email_hash] = row
+
+    def _find_row(self, email: str) -> int | None:
+        row = self._rows_by_email_hash.get(hash(email))
+        if row is not None and self.emails[row] == email:
+            return row
+        return self._colliding_rows_by_email.get(email)
+
+    def _get_user(self, row: int) -> User:
+        return User(id=self.ids[row], email=self.emails[row], name=self.names[row])
+
+    def _contains(self, row: int, search_query: str) -> bool:
+        return search_query in self.emails[row] or search_query in self.names[row]
+
+
+class StringColumn:
+    """Append-only list of strings stored in one utf-8 buffer with an array of end offsets."""
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self.offsets = array("q")
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, row: int) -> str:
+        start = self.offsets[row - 1] if row else 0
+        return self.buffer[start:self.offsets[row]].decode()
+
+    def append(self, value: str) -> None:
+        self.buffer += value.encode()
+        self.offsets.append(len(self.buffer))
+
+
+def _tail(rows: Sequence[int], start: int) -> Iterator[int]:
+    """Iterate over sorted rows starting from the passed one."""
+    return map(rows.__getitem__, range(bisect_left(rows, start), len(rows)))
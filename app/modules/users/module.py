@@ -1,28 +1,101 @@
-from rodi import Container
+from rodi import ActivationScope, Container
 
-from app.modules.users.domain.commands import CreateUserRequest
+from app.modules.users.domain.commands import CreateUserRequest, CreateUsersBatchRequest
 from app.modules.users.domain.events import UserCreatedEvent
-from app.modules.users.domain.queries import GetUsersQuery
+from app.modules.users.domain.queries import ExportUsersQuery, GetUsersByIdsQuery, GetUsersQuery
+from app.modules.users.infrastructure.journal import UsersJournal
 from app.modules.users.infrastructure.repository import InMemoryUserRepository, AbstractUserRepository
-from app.modules.users.service_layer.command_handlers import CreateUserHandler
+from app.modules.users.infrastructure.sqlite_repository import SCHEMA, SqliteUserRepository
+from app.modules.users.infrastructure.storage import (
+    AbstractUsersStorage,
+    CompactUsersStorage,
+    UsersStorage,
+)
+from app.modules.users.service_layer.command_handlers import CreateUserHandler, CreateUsersBatchHandler
 from app.modules.users.service_layer.event_handlers import UserCreatedEventHandler
-from app.modules.users.service_layer.query_handlers import GetUsersQueryHandler
+from app.modules.users.service_layer.query_handlers import (
+    ExportUsersQueryHandler,
+    GetUsersByIdsQueryHandler,
+    GetUsersQueryHandler,
+)
+from app.seedwork.application.mediator.cache import QueryCache
 from app.seedwork.application.mediator.events.map import EventMap
 from app.seedwork.application.mediator.request import RequestMap
+from app.seedwork.application.mediator.single_flight import SingleFlightMiddleware
 from app.seedwork.application.modules import BusinessModule
+from app.seedwork.infrastructure.sqlite import SqlitePool
+from app.settings import UsersSettings
 
 
 class UsersModule(BusinessModule):
 
     def register_dependencies(self, container: Container):
-        container.register(AbstractUserRepository, InMemoryUserRepository)
+        # read from the environment once, the repository factory needs it on every request
+        container.add_singleton_by_factory(lambda: UsersSettings(), UsersSettings)
+        container.add_singleton_by_factory(_build_users_storage, AbstractUsersStorage)
+        container.add_singleton_by_factory(_build_sqlite_repository, SqliteUserRepository)
+        container.add_transient_by_factory(_build_user_repository, AbstractUserRepository)
         container.register(CreateUserHandler)
+        container.register(CreateUsersBatchHandler)
         container.register(UserCreatedEventHandler)
         container.register(GetUsersQueryHandler)
+        container.register(ExportUsersQueryHandler)
+        container.register(GetUsersByIdsQueryHandler)
 
     def register_requests(self, request_map: RequestMap):
         request_map.bind(CreateUserRequest, CreateUserHandler)
+        request_map.bind(CreateUsersBatchRequest, CreateUsersBatchHandler)
         request_map.bind(GetUsersQuery, GetUsersQueryHandler)
+        request_map.bind(ExportUsersQuery, ExportUsersQueryHandler)
+        request_map.bind(GetUsersByIdsQuery, GetUsersByIdsQueryHandler)
 
     def register_events(self, event_map: EventMap):
         event_map.bind(UserCreatedEvent, UserCreatedEventHandler)
+
+    def register_query_cache(self, query_cache: QueryCache, container: Container):
+        # invalidation is local to the process, while sqlite is shared with other workers,
+        # which would serve users they didn't see created until the ttl expires; the
+        # generation is still tracked, so single flight doesn't join queries of old users
+        query_cache.register(
+            GetUsersQuery,
+            invalidated_by=[UserCreatedEvent],
+            cached=container.resolve(UsersSettings).users_repository != "sqlite",
+        )
+
+    def register_single_flight(self, single_flight: SingleFlightMiddleware):
+        single_flight.register(GetUsersQuery)
+
+
+def _build_users_storage(scope: ActivationScope) -> AbstractUsersStorage:
+    settings = scope.provider.get(UsersSettings)
+    if settings.users_storage == "compact":
+        storage = CompactUsersStorage()
+    else:
+        storage = UsersStorage()
+
+    if settings.users_journal_dir:
+        journal = UsersJournal(
+            settings.users_journal_dir,
+            snapshot_every=settings.users_snapshot_every,
+            fsync=settings.users_journal_fsync,
+        )
+        journal.recover(storage)
+        storage.journal = journal
+    return storage
+
+
+def _build_sqlite_repository(scope: ActivationScope) -> SqliteUserRepository:
+    settings = scope.provider.get(UsersSettings)
+    pool = SqlitePool(
+        settings.users_sqlite_path,
+        size=settings.users_sqlite_pool_size,
+        init_script=SCHEMA,
+    )
+    return SqliteUserRepository(pool)
+
+
+def _build_user_repository(scope: ActivationScope) -> AbstractUserRepository:
+    settings = scope.provider.get(UsersSettings)
+    if settings.users_repository == "sqlite":
+        return scope.provider.get(SqliteUserRepository)
+    return InMemoryUserRepository(scope.provider.get(AbstractUsersStorage))
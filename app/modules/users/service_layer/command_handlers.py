@@ -1,9 +1,14 @@
 import logging
 
-from app.modules.users.domain.commands import CreateUserRequest, CreateUserResponse
+from app.modules.users.domain.commands import (
+    CreateUserRequest,
+    CreateUserResponse,
+    CreateUsersBatchRequest,
+    CreateUsersBatchResponse,
+)
 from app.modules.users.domain.events import UserCreatedEvent
 from app.modules.users.infrastructure.errors import DuplicateKeyError
-from app.modules.users.infrastructure.repository import AbstractUserRepository
+from app.modules.users.infrastructure.repository import AbstractUserRepository, normalize_email
 from app.modules.users.service_layer.errors import UserAlreadyRegistered
 from app.seedwork.application.mediator.request import RequestHandler
 
@@ -21,10 +26,33 @@ class CreateUserHandler(RequestHandler[CreateUserRequest, CreateUserResponse]):
         except DuplicateKeyError:
             raise UserAlreadyRegistered("User with this email already registered.")
         self.events.append(
-            UserCreatedEvent(id=user_id, email=request.email, name=request.name)
+            UserCreatedEvent(id=user_id, email=normalize_email(request.email), name=request.name)
         )
         return CreateUserResponse(id=user_id)
 
     @property
     def events(self):
         return self._events
+
+
+class CreateUsersBatchHandler(RequestHandler[CreateUsersBatchRequest, CreateUsersBatchResponse]):
+    """Creates users in one repository call, already registered users are skipped."""
+
+    def __init__(self, repository: AbstractUserRepository):
+        self.repo = repository
+        self._events = []
+
+    async def handle(self, request: CreateUsersBatchRequest) -> CreateUsersBatchResponse:
+        user_ids = await self.repo.create_many(
+            [(user.email, user.name) for user in request.users]
+        )
+        self.events.extend(
+            UserCreatedEvent(id=user_id, email=normalize_email(user.email), name=user.name)
+            for user_id, user in zip(user_ids, request.users)
+            if user_id is not None
+        )
+        return CreateUsersBatchResponse(ids=user_ids)
+
+    @property
+    def events(self):
+        return self._events
@@ -10,6 +10,8 @@ class UserCreatedEventHandler(EventHandler[UserCreatedEvent]):
     Handles the request for user verification and sends a verification email to the user.
     """
 
+    # sending email is slow, don't keep the request waiting for it
+    deferred = True
     subject = "Email confirmation"
     template_name: str = "emails/email-confirmation.html"
 
@@ -1,5 +1,13 @@
-from app.modules.users.domain.queries import GetUsersQuery, GetUsersQueryResult
+from app.modules.users.domain.queries import (
+    ExportUsersQuery,
+    ExportUsersQueryResult,
+    GetUsersByIdsQuery,
+    GetUsersByIdsQueryResult,
+    GetUsersQuery,
+    GetUsersQueryResult,
+)
 from app.modules.users.infrastructure.repository import AbstractUserRepository
+from app.seedwork.application.mediator.batching import BatchRequestHandler
 from app.seedwork.application.mediator.request import RequestHandler
 
 
@@ -8,6 +16,47 @@ class GetUsersQueryHandler(RequestHandler[GetUsersQuery, GetUsersQueryResult]):
         self.repo = repository
 
     async def handle(self, request: GetUsersQuery) -> GetUsersQueryResult:
-        users = await self.repo.get_list(request.search_query, request.limit, request.offset)
-        users_count = await self.repo.get_count(request.search_query)
-        return GetUsersQueryResult(data=users, count=users_count)
+        # one extra user tells whether there is a next page
+        users, users_count = await self.repo.get_page(
+            request.search_query,
+            request.limit + 1,
+            request.offset,
+            request.with_count,
+            request.after_id,
+        )
+        next_after_id = None
+        if len(users) > request.limit:
+            users = users[:request.limit]
+            next_after_id = users[-1].id
+        return GetUsersQueryResult(data=users, count=users_count, next_after_id=next_after_id)
+
+
+class ExportUsersQueryHandler(RequestHandler[ExportUsersQuery, ExportUsersQueryResult]):
+    def __init__(self, repository: AbstractUserRepository):
+        self.repo = repository
+
+    async def handle(self, request: ExportUsersQuery) -> ExportUsersQueryResult:
+        return ExportUsersQueryResult(users=self.repo.iter_users(request.search_query))
+
+
+class GetUsersByIdsQueryHandler(
+    BatchRequestHandler[GetUsersByIdsQuery, GetUsersByIdsQueryResult]
+):
+    """Loads users of all queries sent at the same time with one repository call."""
+
+    def __init__(self, repository: AbstractUserRepository):
+        self.repo = repository
+
+    async def handle_batch(
+        self, requests: list[GetUsersByIdsQuery]
+    ) -> list[GetUsersByIdsQueryResult]:
+        user_ids = list(dict.fromkeys(
+            user_id for request in requests for user_id in request.user_ids
+        ))
+        users = await self.repo.get_many(user_ids)
+        return [
+            GetUsersByIdsQueryResult(
+                data=[users[user_id] for user_id in request.user_ids if user_id in users]
+            )
+            for request in requests
+        ]
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import math
 from contextlib import asynccontextmanager
 from http import HTTPStatus
 
@@ -12,9 +14,22 @@ from starlette.middleware.trustedhost import TrustedHostMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
+from app.modules.users.infrastructure.sqlite_repository import SqliteUserRepository
+from app.modules.users.infrastructure.storage import AbstractUsersStorage
+from app.presentation.api.common.errors import CommonErrorCode
 from app.presentation.api.dependencies.services import get_mediator, get_container
+from app.presentation.api.health import LoadSheddingMiddleware, router as health_router
+from app.presentation.api.metrics import HTTPMetricsMiddleware, router as metrics_router
+from app.seedwork.application.mediator.admission import AdmissionRejected, RateLimitExceeded
+from app.seedwork.application.mediator.events.background import BackgroundEventDispatcher
 from app.seedwork.application.mediator.mediator import Mediator
-from app.settings import AppSettings, WebSettings
+from app.seedwork.infrastructure.email_outbox import EmailOutbox
+from app.seedwork.infrastructure.email_sender import AbstractEmailSender
+from app.seedwork.infrastructure.loop_monitor import LoopLagMonitor
+from app.seedwork.infrastructure.mailjet import MailjetClient
+from app.seedwork.infrastructure.metrics import MetricsRegistry
+from app.seedwork.infrastructure.template_loader import AbstractTemplateRenderer
+from app.settings import AppSettings, MailSettings, UsersSettings, WebSettings
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +41,17 @@ async def permission_error_handler(request: Request, exc: PermissionError):
     )
 
 
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    if isinstance(exc, RateLimitExceeded):
+        status_code, detail = HTTPStatus.TOO_MANY_REQUESTS, CommonErrorCode.TOO_MANY_REQUESTS
+    else:
+        status_code, detail = HTTPStatus.SERVICE_UNAVAILABLE, CommonErrorCode.SERVICE_OVERLOADED
+    headers = None
+    if exc.retry_after is not None:
+        headers = {"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
+    return JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
+
+
 def setup_middleware(app: FastAPI, settings: WebSettings):
     app.add_middleware(
         TrustedHostMiddleware,
@@ -42,6 +68,25 @@ def setup_middleware(app: FastAPI, settings: WebSettings):
     logger.info("Middleware set up")
 
 
+def setup_metrics(app: FastAPI, container: Container, settings: WebSettings):
+    if not settings.metrics_enabled:
+        logger.info("Metrics were not set up")
+        return
+    app.add_middleware(HTTPMetricsMiddleware, metrics=container.resolve(MetricsRegistry))
+    app.include_router(metrics_router)
+    logger.info("Metrics set up")
+
+
+def setup_load_shedding(app: FastAPI, container: Container, settings: WebSettings):
+    app.add_middleware(
+        LoadSheddingMiddleware,
+        monitor=container.resolve(LoopLagMonitor),
+        low_priority_paths=settings.low_priority_paths,
+    )
+    app.include_router(health_router)
+    logger.info("Load shedding set up")
+
+
 def setup_sentry(app: FastAPI, settings: AppSettings):
     if settings.sentry_dsn:
         sentry_sdk.init(
@@ -58,13 +103,39 @@ def setup_sentry(app: FastAPI, settings: AppSettings):
 
 def setup_exception_handlers(app: FastAPI):
     app.add_exception_handler(PermissionError, permission_error_handler)
+    app.add_exception_handler(AdmissionRejected, admission_rejected_handler)
     logger.info("Exception handlers set up")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    container: Container = app.state.container
+    background_dispatcher = container.resolve(BackgroundEventDispatcher)
+    loop_monitor = container.resolve(LoopLagMonitor)
+    email_sender = container.resolve(AbstractEmailSender)
+    # recovery from the journal blocks, so it runs in a thread and the app is not
+    # ready until users are loaded
+    users_storage = await asyncio.to_thread(container.resolve, AbstractUsersStorage)
+
+    container.resolve(AbstractTemplateRenderer).precompile()
+    background_dispatcher.start()
+    loop_monitor.start()
+    email_sender.start()
     logger.info("Lifespan: init completed")
     yield
+    await loop_monitor.stop()
+    await background_dispatcher.stop()
+    if users_storage.journal is not None:
+        # waits for a running compaction
+        await asyncio.to_thread(users_storage.journal.close)
+    # after deferred handlers, they may still send emails
+    await email_sender.aclose()
+    if container.resolve(MailSettings).email_outbox_enabled:
+        await asyncio.to_thread(container.resolve(EmailOutbox).close)
+    await container.resolve(MailjetClient).aclose()
+    if container.resolve(UsersSettings).users_repository == "sqlite":
+        # waits for running queries
+        await asyncio.to_thread(container.resolve(SqliteUserRepository).close)
     logger.info("Lifespan: unloaded")
 
 
@@ -74,6 +145,8 @@ def setup_dependencies(
     mediator: Mediator,
 ):
     """Replace stubs with real implementation."""
+    app.state.container = container
+    app.state.mediator = mediator
     app.dependency_overrides[get_container] = lambda: container
     app.dependency_overrides[get_mediator] = lambda: mediator
 
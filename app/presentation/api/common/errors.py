@@ -12,6 +12,9 @@ class ErrorModel(BaseSchema):
 
 class CommonErrorCode(str, Enum):
     NOT_FOUND = "NOT_FOUND"
+    INVALID_CURSOR = "INVALID_CURSOR"
+    TOO_MANY_REQUESTS = "TOO_MANY_REQUESTS"
+    SERVICE_OVERLOADED = "SERVICE_OVERLOADED"
 
 
 class HTTPNotFound(HTTPException):
@@ -20,3 +23,11 @@ class HTTPNotFound(HTTPException):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=CommonErrorCode.NOT_FOUND
         )
+
+
+class HTTPInvalidCursor(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=CommonErrorCode.INVALID_CURSOR
+        )
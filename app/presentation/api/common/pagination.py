@@ -1,20 +1,58 @@
 from __future__ import annotations
 
+import base64
+import binascii
 from collections.abc import Sequence
 from typing import Generic, TypeVar
 
 from fastapi import Query
 
+from app.presentation.api.common.errors import HTTPInvalidCursor
 from app.presentation.api.common.schemas.base import BaseSchema
 
 T = TypeVar("T")
 
 
 class Page(BaseSchema, Generic[T]):
-    count: int
+    count: int | None
     data: Sequence[T]
+    next_cursor: str | None = None
 
 
 class Params(BaseSchema):
     limit: int = Query(25, ge=1, le=100, description="Page size limit")
     offset: int = Query(0, ge=0, description="Page offset")
+    with_count: bool = Query(
+        True, description="Calculate total count, disable it for large result sets"
+    )
+    after: str | None = Query(
+        None, description="Cursor of the previous page, returned as nextCursor"
+    )
+
+    @property
+    def after_id(self) -> int | None:
+        """Decoded cursor.
+
+        :raises HTTPInvalidCursor when cursor is malformed
+        """
+        if self.after is None:
+            return None
+        return decode_cursor(self.after)
+
+
+def encode_cursor(last_id: int | None) -> str | None:
+    """Build an opaque cursor pointing right after the object with passed id."""
+    if last_id is None:
+        return None
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        last_id = int(base64.urlsafe_b64decode(cursor + padding).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPInvalidCursor() from None
+    if last_id < 0:
+        raise HTTPInvalidCursor()
+    return last_id
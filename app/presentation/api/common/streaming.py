@@ -0,0 +1,42 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+
+async def iter_ndjson(
+    rows: AsyncIterator[dict[str, Any]], chunk_size: int = 500
+) -> AsyncIterator[str]:
+    """Serialize rows to newline delimited json, several rows per chunk."""
+    lines = []
+    async for row in rows:
+        lines.append(json.dumps(row, ensure_ascii=False))
+        if len(lines) == chunk_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+async def iter_csv(
+    rows: AsyncIterator[dict[str, Any]], fieldnames: Sequence[str], chunk_size: int = 500
+) -> AsyncIterator[str]:
+    """Serialize rows to csv with a header, several rows per chunk."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    rows_in_buffer = 0
+    async for row in rows:
+        writer.writerow(row)
+        rows_in_buffer += 1
+        if rows_in_buffer == chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows_in_buffer = 0
+    if buffer.tell():
+        yield buffer.getvalue()
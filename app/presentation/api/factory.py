@@ -2,6 +2,8 @@ import logging.config
 
 from app.presentation.api.api_setup import (
     setup_exception_handlers,
+    setup_load_shedding,
+    setup_metrics,
     setup_middleware,
     setup_sentry,
     lifespan,
@@ -29,6 +31,8 @@ def create_app() -> FastAPI:
     app = FastAPI(lifespan=lifespan, **web_settings.fastapi_kwargs)
 
     setup_middleware(app, web_settings)
+    setup_load_shedding(app, container, web_settings)
+    setup_metrics(app, container, web_settings)
     setup_dependencies(app, container, mediator)
     setup_exception_handlers(app)
     setup_sentry(app, app_settings)
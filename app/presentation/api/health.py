@@ -0,0 +1,71 @@
+from collections.abc import Sequence
+from typing import Annotated
+
+from fastapi import APIRouter
+from starlette import status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.presentation.api.common.errors import CommonErrorCode
+from app.presentation.api.dependencies.services import depends
+from app.seedwork.infrastructure.loop_monitor import LoopLagMonitor
+
+router = APIRouter()
+
+
+@router.get("/healthz", include_in_schema=False)
+async def healthz():
+    """Liveness, the process serves requests."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz", include_in_schema=False)
+async def readyz(monitor: Annotated[LoopLagMonitor, depends(LoopLagMonitor)]):
+    """Readiness, unhealthy while the event loop is overloaded."""
+    ready = monitor.running and not monitor.overloaded
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ok" if ready else "overloaded",
+            "lag": round(monitor.lag, 4),
+            "in_flight": monitor.in_flight,
+        },
+    )
+
+
+class LoadSheddingMiddleware:
+    """Counts requests in flight and rejects low priority ones while the loop is overloaded.
+
+    Routes are matched by path prefix before routing, so shedding costs nothing.
+    """
+
+    def __init__(
+        self, app: ASGIApp, monitor: LoopLagMonitor, low_priority_paths: Sequence[str] = ()
+    ) -> None:
+        self.app = app
+        self.monitor = monitor
+        self.low_priority_paths = tuple(low_priority_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if (
+            self.low_priority_paths
+            and scope["path"].startswith(self.low_priority_paths)
+            and self.monitor.overloaded
+        ):
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": CommonErrorCode.SERVICE_OVERLOADED},
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.monitor.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.in_flight -= 1
@@ -0,0 +1,57 @@
+import time
+from typing import Annotated
+
+from fastapi import APIRouter
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.presentation.api.dependencies.services import depends
+from app.seedwork.infrastructure.metrics import MetricsRegistry
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4"
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(registry: Annotated[MetricsRegistry, depends(MetricsRegistry)]):
+    """Metrics in the Prometheus text format."""
+    return PlainTextResponse(registry.export(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
+class HTTPMetricsMiddleware:
+    """Records latency of HTTP requests per route template, method and status."""
+
+    def __init__(self, app: ASGIApp, metrics: MetricsRegistry) -> None:
+        self.app = app
+        self._duration = metrics.histogram(
+            "http_request_duration_seconds",
+            "Time of handling HTTP requests.",
+            ["route", "method", "status"],
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def _send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            # the router puts the matched route into the scope, templates keep labels bounded
+            route = scope.get("route")
+            self._duration.observe(
+                time.perf_counter() - started,
+                route.path if route is not None else "unmatched",
+                scope["method"],
+                str(status_code),
+            )
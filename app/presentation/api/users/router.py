@@ -1,17 +1,44 @@
+from collections.abc import AsyncIterator
+from typing import Any
+
 from fastapi import APIRouter, Body, HTTPException, Depends
 from starlette import status
+from starlette.responses import StreamingResponse
 
-from app.modules.users.domain.commands import CreateUserResponse, CreateUserRequest
-from app.modules.users.domain.queries import GetUsersQuery, GetUsersQueryResult
+from app.modules.users.domain.commands import (
+    CreateUserResponse,
+    CreateUserRequest,
+    CreateUsersBatchRequest,
+    CreateUsersBatchResponse,
+    NewUser,
+)
+from app.modules.users.domain.models import User
+from app.modules.users.domain.queries import (
+    ExportUsersQuery,
+    ExportUsersQueryResult,
+    GetUsersByIdsQuery,
+    GetUsersByIdsQueryResult,
+    GetUsersQuery,
+    GetUsersQueryResult,
+)
 from app.modules.users.service_layer.errors import UserAlreadyRegistered
-from app.presentation.api.common.errors import ErrorModel
-from app.presentation.api.common.pagination import Page, Params
+from app.presentation.api.common.errors import ErrorModel, HTTPNotFound
+from app.presentation.api.common.pagination import Page, Params, encode_cursor
 from app.presentation.api.common.schemas.base import ObjectCreatedResponse
+from app.presentation.api.common.streaming import (
+    CSV_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    iter_csv,
+    iter_ndjson,
+)
 from app.presentation.api.dependencies.services import MediatorDep
 from app.presentation.api.users.schemas import (
     ErrorCode,
+    ExportFormat,
     CreateUserSchema,
+    CreateUsersBatchSchema,
     UserReadSchema,
+    UsersBatchCreatedResponse,
 )
 
 router = APIRouter()
@@ -56,17 +83,128 @@ async def create_user(
         )
 
 
+@router.post(
+    "/batch",
+    name="user:create-batch",
+    status_code=status.HTTP_201_CREATED,
+    response_model=UsersBatchCreatedResponse,
+    responses={
+        status.HTTP_201_CREATED: {
+            "description": (
+                "Users created. Results are in the order of passed users, "
+                "already registered users have an error instead of an id."
+            ),
+        },
+    },
+)
+async def create_users_batch(
+    mediator: MediatorDep,
+    data: CreateUsersBatchSchema = Body(),
+):
+    """Create many users at once."""
+    result: CreateUsersBatchResponse = await mediator.send(
+        CreateUsersBatchRequest(
+            users=[NewUser(email=user.email, name=user.name) for user in data.users]
+        )
+    )
+    return {
+        "results": [
+            {"id": user_id}
+            if user_id is not None
+            else {"error": ErrorCode.USER_ALREADY_REGISTERED}
+            for user_id in result.ids
+        ]
+    }
+
+
 @router.get(
     "/",
     response_model=Page[UserReadSchema],
     status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ErrorModel,
+            "description": "Malformed cursor.",
+        },
+    },
 )
 async def get_users(
     mediator: MediatorDep,
     q: str | None = None,
     params: Params = Depends(),
 ):
+    """Get users page.
+
+    Pass nextCursor of the previous page as the after parameter to paginate by
+    cursor, it stays fast for deep pages unlike offset.
+    """
     result: GetUsersQueryResult = await mediator.send(
-        GetUsersQuery(search_query=q, limit=params.limit, offset=params.offset)
+        GetUsersQuery(
+            search_query=q,
+            limit=params.limit,
+            offset=params.offset,
+            with_count=params.with_count,
+            after_id=params.after_id,
+        )
+    )
+    return Page[UserReadSchema](
+        count=result.count,
+        data=result.data,
+        next_cursor=encode_cursor(result.next_after_id),
     )
-    return Page[UserReadSchema](count=result.count, data=result.data)
+
+
+@router.get(
+    "/export",
+    name="user:export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "description": "All matched users, one per line.",
+            "content": {NDJSON_MEDIA_TYPE: {}, CSV_MEDIA_TYPE: {}},
+        },
+    },
+)
+async def export_users(
+    mediator: MediatorDep,
+    q: str | None = None,
+    format: ExportFormat = ExportFormat.NDJSON,
+):
+    """Export all users as NDJSON or CSV.
+
+    Users are serialized while they are read, so the response is not kept in memory.
+    """
+    result: ExportUsersQueryResult = await mediator.send(ExportUsersQuery(search_query=q))
+    rows = _user_rows(result.users)
+    if format == ExportFormat.CSV:
+        return StreamingResponse(
+            iter_csv(rows, fieldnames=list(UserReadSchema.model_fields)),
+            media_type=CSV_MEDIA_TYPE,
+        )
+    return StreamingResponse(iter_ndjson(rows), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def _user_rows(users: AsyncIterator[User]) -> AsyncIterator[dict[str, Any]]:
+    async for user in users:
+        yield {"id": user.id, "email": user.email, "name": user.name}
+
+
+@router.get(
+    "/{user_id}",
+    name="user:get",
+    response_model=UserReadSchema,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"model": ErrorModel, "description": "User not found."},
+    },
+)
+async def get_user(mediator: MediatorDep, user_id: int):
+    """Get user by id.
+
+    Concurrent requests are loaded from the repository together.
+    """
+    result: GetUsersByIdsQueryResult = await mediator.send(GetUsersByIdsQuery(user_ids=[user_id]))
+    if not result.data:
+        raise HTTPNotFound()
+    return result.data[0]
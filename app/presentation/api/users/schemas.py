@@ -1,5 +1,7 @@
 from enum import Enum
 
+from pydantic import Field
+
 from app.presentation.api.common.schemas.base import BaseSchema
 
 
@@ -7,11 +9,29 @@ class ErrorCode(str, Enum):
     USER_ALREADY_REGISTERED = "USER_ALREADY_REGISTERED"
 
 
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class CreateUserSchema(BaseSchema):
     email: str
     name: str
 
 
+class CreateUsersBatchSchema(BaseSchema):
+    users: list[CreateUserSchema] = Field(min_length=1, max_length=1000)
+
+
+class BatchItemResult(BaseSchema):
+    id: int | None = None
+    error: ErrorCode | None = None
+
+
+class UsersBatchCreatedResponse(BaseSchema):
+    results: list[BatchItemResult]
+
+
 class UserReadSchema(BaseSchema):
     id: int
     email: str
@@ -2,13 +2,24 @@ from rodi import Container
 
 from app.modules.users.module import UsersModule
 from app.presentation.container import setup_container
+from app.seedwork.application.mediator.admission import AdmissionMiddleware, AdmissionPolicy
+from app.seedwork.application.mediator.cache import CachingMiddleware, QueryCache, QueryCacheInvalidator
 from app.seedwork.application.mediator.container import RodiContainer
+from app.seedwork.application.mediator.events.background import BackgroundEventDispatcher
 from app.seedwork.application.mediator.events.event_emitter import EventEmitter
 from app.seedwork.application.mediator.events.map import EventMap
 from app.seedwork.application.mediator.mediator import Mediator
-from app.seedwork.application.mediator.message_brokers import StubMessageBroker
+from app.seedwork.application.mediator.message_brokers import MeasuredMessageBroker, StubMessageBroker
+from app.seedwork.application.mediator.metrics import (
+    MetricsMiddleware,
+    register_query_cache_metrics,
+    register_single_flight_metrics,
+)
 from app.seedwork.application.mediator.middlewares import MiddlewareChain, LoggingMiddleware
 from app.seedwork.application.mediator.request import RequestMap
+from app.seedwork.application.mediator.single_flight import SingleFlightMiddleware
+from app.seedwork.infrastructure.metrics import MetricsRegistry
+from app.settings import AdmissionSettings, MediatorSettings, QueryCacheSettings
 
 MODULES = [UsersModule]
 
@@ -20,21 +31,65 @@ def bootstrap() -> tuple[Container, Mediator]:
     request_map = RequestMap()
     rodi_container = RodiContainer(container)
 
+    query_cache_settings = QueryCacheSettings()
+    query_cache = QueryCache(
+        max_size=query_cache_settings.query_cache_max_size,
+        ttl=query_cache_settings.query_cache_ttl,
+    )
+    container.add_instance(query_cache)
+    container.register(QueryCacheInvalidator)
+
+    single_flight = SingleFlightMiddleware(query_cache)
+    container.add_instance(single_flight)
+
     models = []
     for module_cls in MODULES:
         module = module_cls()
         module.register_dependencies(container)
         module.register_events(event_map)
         module.register_requests(request_map)
+        module.register_query_cache(query_cache, container)
+        module.register_single_flight(single_flight)
+
+    for event_type in query_cache.invalidating_events:
+        event_map.bind(event_type, QueryCacheInvalidator)
+
+    metrics = container.resolve(MetricsRegistry)
+    register_query_cache_metrics(metrics, query_cache)
 
     middleware_chain = MiddlewareChain()
+    middleware_chain.add(MetricsMiddleware(metrics))
     middleware_chain.add(LoggingMiddleware())
+    middleware_chain.add(CachingMiddleware(query_cache))
+
+    mediator_settings = MediatorSettings()
+    if mediator_settings.single_flight:
+        middleware_chain.add(single_flight)
+        register_single_flight_metrics(metrics, single_flight)
+    admission_middleware = _build_admission_middleware(AdmissionSettings(), request_map)
+    if admission_middleware is not None:
+        middleware_chain.add(admission_middleware)
+    background_dispatcher = BackgroundEventDispatcher(
+        workers=mediator_settings.background_event_workers,
+        queue_size=mediator_settings.background_event_queue_size,
+        max_retries=mediator_settings.background_event_max_retries,
+        retry_delay=mediator_settings.background_event_retry_delay,
+        drain_timeout=mediator_settings.background_event_drain_timeout,
+        max_dead_letters=mediator_settings.background_event_max_dead_letters,
+        metrics=metrics,
+    )
+    container.add_instance(background_dispatcher)
 
     event_emitter = EventEmitter(
         # message_broker=RedisMessageBroker(container.resolve(Redis)),
-        message_broker=StubMessageBroker(),
+        message_broker=MeasuredMessageBroker(StubMessageBroker(), metrics),
         event_map=event_map,
         container=rodi_container,
+        concurrent=mediator_settings.events_concurrent,
+        max_concurrent_events=mediator_settings.events_max_concurrency,
+        handler_timeout=mediator_settings.event_handler_timeout,
+        background_dispatcher=background_dispatcher,
+        metrics=metrics,
     )
 
     mediator = Mediator(
@@ -43,4 +98,29 @@ def bootstrap() -> tuple[Container, Mediator]:
         container=rodi_container,
         middleware_chain=middleware_chain,
     )
+
+    rodi_container.freeze()
+    mediator.freeze()
     return container, mediator
+
+
+def _build_admission_middleware(
+    settings: AdmissionSettings, request_map: RequestMap
+) -> AdmissionMiddleware | None:
+    request_types = {
+        request_type.__name__: request_type for request_type in request_map.get_requests()
+    }
+    unknown = set(settings.admission_limits) - set(request_types)
+    if unknown:
+        raise ValueError(f"Admission limits are set for unknown requests: {', '.join(unknown)}")
+
+    default = settings.default_limit
+    if default is None and not settings.admission_limits:
+        return None
+    return AdmissionMiddleware(
+        policies={
+            request_types[name]: AdmissionPolicy(**limit.model_dump())
+            for name, limit in settings.admission_limits.items()
+        },
+        default=AdmissionPolicy(**default.model_dump()) if default else None,
+    )
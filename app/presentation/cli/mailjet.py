@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+import typer
+import uvicorn
+
+from app.presentation.cli.utils import async_command
+from app.seedwork.infrastructure.email_sender import BatchingEmailSender, EmailSender
+from app.seedwork.infrastructure.mailjet import MailjetClient
+from app.seedwork.infrastructure.mailjet_fake import FakeMailjet
+
+
+@async_command
+async def bench_command(
+    count: int = typer.Option(2000, help="Emails to send."),
+    concurrency: int = typer.Option(50, help="Emails sent at once."),
+    latency: float = typer.Option(0.0, help="Latency of the fake Mailjet in seconds."),
+    max_keepalive: int = typer.Option(
+        None, help="Idle connections kept for reuse, defaults to concurrency, 0 disables reuse."
+    ),
+    batch_size: int = typer.Option(1, help="Emails sent in one request, 1 disables batching."),
+    port: int = typer.Option(8025, help="Port of the fake Mailjet."),
+):
+    """Measure sends per second of MailjetClient against a local fake Mailjet over TCP."""
+    fake = FakeMailjet(latency=latency)
+    server = uvicorn.Server(
+        uvicorn.Config(fake, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    )
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    client = MailjetClient(
+        ("key", "secret"),
+        base_url=f"http://127.0.0.1:{port}/v3.1",
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency if max_keepalive is None else max_keepalive,
+    )
+    if batch_size > 1:
+        sender = BatchingEmailSender(
+            client, "noreply@example.com", "Example", max_batch_size=batch_size
+        )
+    else:
+        sender = EmailSender(client, "noreply@example.com", "Example")
+    pending = iter(range(count))
+
+    async def _worker():
+        for idx in pending:
+            await sender.send(f"user{idx}@example.com", "Benchmark", "<p>Hi</p>")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    await sender.aclose()
+    await client.aclose()
+    server.should_exit = True
+    await server_task
+    typer.echo(
+        f"{fake.sent} emails in {fake.requests} requests, {elapsed:.2f}s, "
+        f"{fake.sent / elapsed:.0f} emails/s"
+    )
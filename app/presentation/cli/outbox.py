@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import typer
+
+from app.presentation.cli.utils import async_command
+from app.presentation.container import setup_container
+from app.seedwork.infrastructure.email_outbox import EmailOutbox
+
+
+@async_command
+async def dead_letters_command(
+    limit: int = typer.Option(20, help="Latest dead letters to show."),
+):
+    """Show emails which failed all attempts."""
+    outbox = setup_container().resolve(EmailOutbox)
+    queued, dead = await outbox.counts()
+    typer.echo(f"{queued} emails queued, {dead} dead letters")
+    for letter in await outbox.get_dead_letters(limit):
+        failed_at = datetime.fromtimestamp(letter.failed_at).isoformat(timespec="seconds")
+        typer.echo(
+            f"{letter.id}\t{failed_at}\t{letter.attempts} attempts\t"
+            f"{letter.destination}\t{letter.subject!r}\t{letter.error}"
+        )
+    outbox.close()
+
+
+@async_command
+async def replay_command(
+    ids: list[int] = typer.Argument(None, help="Ids of dead letters to send again."),
+    all_: bool = typer.Option(False, "--all", help="Send all dead letters again."),
+):
+    """Queue dead letters again, they are sent by the running web app."""
+    if not ids and not all_:
+        typer.echo("Pass ids of dead letters or --all.", err=True)
+        raise typer.Exit(1)
+    outbox = setup_container().resolve(EmailOutbox)
+    count = await outbox.replay(None if all_ else ids)
+    outbox.close()
+    typer.echo(f"{count} emails queued again")
@@ -0,0 +1,79 @@
+import logging
+import time
+
+import typer
+
+from app.modules.users.domain.commands import CreateUserRequest
+from app.presentation.bootstrap import bootstrap
+from app.presentation.cli.utils import async_command
+from app.seedwork.application.mediator.events.background import BackgroundEventDispatcher
+from app.seedwork.infrastructure.email_sender import AbstractEmailSender
+from app.seedwork.infrastructure.template_loader import (
+    AbstractTemplateRenderer,
+    FileSystemTemplateRenderer,
+)
+from app.settings import AppSettings
+
+
+async def _run(count: int, shared: bool) -> tuple[int, float]:
+    """Create ``count`` users through the mediator, return emails rendered and seconds."""
+    container, mediator = bootstrap()
+    dispatcher = container.resolve(BackgroundEventDispatcher)
+    renderer = container.resolve(AbstractTemplateRenderer)
+    email_sender = container.resolve(AbstractEmailSender)
+    rendered = 0
+
+    async def _send(destination: str, subject: str, message: str):
+        nonlocal rendered
+        rendered += 1
+
+    email_sender.send = _send
+    if shared:
+        renderer.precompile()
+    else:
+        settings = AppSettings()
+
+        async def _render_per_event(template_name: str, **kwargs) -> str:
+            # as the transient renderer did, a new environment parses the template again
+            per_event = FileSystemTemplateRenderer(
+                settings.project_path / "templates",
+                renderer.default_render_kwargs,
+                bytecode_cache_dir=settings.templates_cache_path,
+                auto_reload=settings.debug,
+            )
+            return await per_event.render(template_name, **kwargs)
+
+        renderer.render = _render_per_event
+
+    dispatcher.start()
+    started = time.perf_counter()
+    for idx in range(count):
+        await mediator.send(CreateUserRequest(email=f"user{idx}@example.com", name=f"User {idx}"))
+    # waits for the deferred UserCreatedEventHandler
+    await dispatcher.stop()
+    return rendered, time.perf_counter() - started
+
+
+@async_command
+async def bench_command(
+    count: int = typer.Option(2000, help="Users created per round."),
+    rounds: int = typer.Option(3, help="Rounds per case, the fastest one is reported."),
+):
+    """Measure confirmation emails rendered per second through Mediator.send.
+
+    Users are created with CreateUserRequest and the email sender replaced by a
+    counter, so the time covers the request, UserCreatedEventHandler and the render.
+    A renderer built per event is compared with the shared precompiled one.
+    """
+    # the repository logs every saved user
+    logging.disable(logging.INFO)
+    results = {"per event": 0.0, "shared": 0.0}
+    for _ in range(rounds):
+        # cases alternate, so both see the same noise
+        for name in results:
+            rendered, elapsed = await _run(count, shared=name == "shared")
+            results[name] = max(results[name], rendered / elapsed)
+    typer.echo(
+        f"renderer per event {results['per event']:8.0f} renders/s, "
+        f"shared {results['shared']:8.0f} renders/s"
+    )
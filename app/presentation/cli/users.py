@@ -0,0 +1,63 @@
+import gc
+import logging
+import time
+import tracemalloc
+
+import typer
+
+from app.modules.users.infrastructure.repository import InMemoryUserRepository
+from app.modules.users.infrastructure.storage import CompactUsersStorage, UsersStorage
+from app.presentation.cli.utils import async_command
+
+STORAGES = {"default": UsersStorage, "compact": CompactUsersStorage}
+
+
+@async_command
+async def bench_insert_command(
+    max_users: int = typer.Option(1_000_000, help="Users stored at the end."),
+    storage: str = typer.Option("default", help="Storage layout, default or compact."),
+):
+    """Measure inserts per second of the in-memory repository as it grows."""
+    # the repository logs every saved user
+    logging.disable(logging.INFO)
+    repository = InMemoryUserRepository(STORAGES[storage]())
+
+    created = 0
+    size = 1000
+    while created < max_users:
+        size = min(size, max_users)
+        started = time.perf_counter()
+        for idx in range(created, size):
+            await repository.create(f"user{idx}@example.com", f"User {idx}")
+        elapsed = time.perf_counter() - started
+        typer.echo(
+            f"{created:>9} -> {size:<9} {(size - created) / elapsed:>10.0f} inserts/s"
+        )
+        created = size
+        size *= 10
+
+
+def bench_storage_command(
+    users: int = typer.Option(1_000_000, help="Users stored."),
+    with_index: bool = typer.Option(False, help="Measure the search index as well."),
+):
+    """Compare memory taken by the default and the compact storage with tracemalloc."""
+    for name, storage_cls in STORAGES.items():
+        gc.collect()
+        tracemalloc.start()
+        started = time.perf_counter()
+        storage = storage_cls()
+        for idx in range(1, users + 1):
+            email, user_name = f"user{idx}@example.com", f"User {idx}"
+            if with_index:
+                storage.add(email, user_name)
+            else:
+                storage.restore(idx, email, user_name)
+        elapsed = time.perf_counter() - started
+        size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        typer.echo(
+            f"{name:<8} {size / 2**20:8.1f} MiB, {size / users:6.0f} B/user, "
+            f"peak {peak / 2**20:8.1f} MiB, filled in {elapsed:.1f}s"
+        )
+        del storage
@@ -2,12 +2,25 @@ import redis.asyncio
 from redis.asyncio import Redis
 from rodi import ActivationScope, Container
 
-from app.seedwork.infrastructure.email_sender import AbstractEmailSender, StubEmailSender
+from app.seedwork.infrastructure.email_outbox import SCHEMA, EmailOutbox, OutboxEmailSender
+from app.seedwork.infrastructure.email_sender import (
+    AbstractEmailSender,
+    BatchingEmailSender,
+    EmailSender,
+    StubEmailSender,
+)
+from app.seedwork.infrastructure.loop_monitor import LoopLagMonitor
+from app.seedwork.infrastructure.mailjet import MailjetClient
+from app.seedwork.infrastructure.metrics import MetricsRegistry
+from app.seedwork.infrastructure.sqlite import SqlitePool
 from app.seedwork.infrastructure.template_loader import FileSystemTemplateRenderer, AbstractTemplateRenderer
 from app.settings import (
+    AdmissionSettings,
     AppSettings,
     LoggingSettings,
     MailSettings,
+    MediatorSettings,
+    QueryCacheSettings,
     RedisSettings,
     WebSettings,
 )
@@ -20,18 +33,21 @@ def setup_container() -> Container:
     # register settings factories
     container.add_transient_by_factory(lambda: AppSettings(), AppSettings)
     container.add_transient_by_factory(lambda: WebSettings(), WebSettings)
+    container.add_transient_by_factory(lambda: AdmissionSettings(), AdmissionSettings)
     container.add_transient_by_factory(lambda: LoggingSettings(), LoggingSettings)
     container.add_transient_by_factory(lambda: MailSettings(), MailSettings)
     container.add_transient_by_factory(lambda: RedisSettings(), RedisSettings)
+    container.add_transient_by_factory(lambda: QueryCacheSettings(), QueryCacheSettings)
+    container.add_transient_by_factory(lambda: MediatorSettings(), MediatorSettings)
 
     # register singletons
+    container.add_instance(MetricsRegistry())
+    container.add_singleton_by_factory(_build_loop_monitor, LoopLagMonitor)
     container.add_singleton_by_factory(_build_redis_client, Redis)
-
-    # register factories
-    container.add_transient_by_factory(
-        _build_template_renderer, AbstractTemplateRenderer
-    )
-    container.add_transient_by_factory(_build_email_sender, AbstractEmailSender)
+    container.add_singleton_by_factory(_build_mailjet_client, MailjetClient)
+    container.add_singleton_by_factory(_build_template_renderer, AbstractTemplateRenderer)
+    container.add_singleton_by_factory(_build_email_outbox, EmailOutbox)
+    container.add_singleton_by_factory(_build_email_sender, AbstractEmailSender)
 
     return container
 
@@ -51,13 +67,71 @@ def _build_template_renderer(scope: ActivationScope) -> AbstractTemplateRenderer
             settings_url=settings.user_settings_url,
             unsubscribe_url=settings.email_unsubscribe_url,
         ),
+        bytecode_cache_dir=app_settings.templates_cache_path,
+        # templates are edited in place during development
+        auto_reload=app_settings.debug,
+    )
+
+
+def _build_mailjet_client(scope: ActivationScope) -> MailjetClient:
+    settings = scope.provider.get(MailSettings)
+    return MailjetClient(
+        (settings.mailjet_api_key, settings.mailjet_secret_key),
+        timeout=settings.mailjet_timeout,
+        base_url=settings.mailjet_base_url,
+        max_connections=settings.mailjet_max_connections,
+        max_keepalive_connections=settings.mailjet_max_keepalive_connections,
+        keepalive_expiry=settings.mailjet_keepalive_expiry,
+        http2=settings.mailjet_http2,
+        max_retries=settings.mailjet_max_retries,
+        retry_backoff=settings.mailjet_retry_backoff,
+        max_retry_delay=settings.mailjet_max_retry_delay,
     )
 
 
+def _build_email_outbox(scope: ActivationScope) -> EmailOutbox:
+    settings = scope.provider.get(MailSettings)
+    return EmailOutbox(SqlitePool(settings.email_outbox_path, init_script=SCHEMA))
+
+
 def _build_email_sender(scope: ActivationScope) -> AbstractEmailSender:
-    # return EmailSender(
-    #     MailjetClient((settings.mailjet_api_key, settings.mailjet_secret_key)),
-    #     from_email=settings.default_from_email,
-    #     from_email_name=settings.default_from_email_name,
-    # )
-    return StubEmailSender()
+    settings = scope.provider.get(MailSettings)
+    sender = _build_mailjet_email_sender(scope)
+    if not settings.email_outbox_enabled:
+        return sender
+    return OutboxEmailSender(
+        scope.provider.get(EmailOutbox),
+        sender,
+        workers=settings.email_outbox_workers,
+        max_attempts=settings.email_outbox_max_attempts,
+        retry_delay=settings.email_outbox_retry_delay,
+        max_retry_delay=settings.email_outbox_max_retry_delay,
+    )
+
+
+def _build_mailjet_email_sender(scope: ActivationScope) -> AbstractEmailSender:
+    settings = scope.provider.get(MailSettings)
+    if not (settings.mailjet_api_key and settings.mailjet_secret_key):
+        return StubEmailSender()
+    if settings.mailjet_batch_size > 1:
+        return BatchingEmailSender(
+            scope.provider.get(MailjetClient),
+            from_email=settings.default_from_email,
+            from_email_name=settings.default_from_email_name,
+            max_batch_size=settings.mailjet_batch_size,
+            max_delay=settings.mailjet_batch_delay,
+        )
+    return EmailSender(
+        scope.provider.get(MailjetClient),
+        from_email=settings.default_from_email,
+        from_email_name=settings.default_from_email_name,
+    )
+
+
+def _build_loop_monitor(scope: ActivationScope) -> LoopLagMonitor:
+    settings = scope.provider.get(WebSettings)
+    return LoopLagMonitor(
+        interval=settings.loop_lag_interval,
+        lag_threshold=settings.loop_lag_threshold,
+        max_in_flight=settings.max_in_flight_requests,
+    )
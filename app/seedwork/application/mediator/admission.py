@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Type
+
+from app.seedwork.application.mediator.middlewares import HandleType, Middleware, Res
+from app.seedwork.application.messages import Request
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Request was not admitted, it may be retried after ``retry_after`` seconds."""
+
+    def __init__(self, request_type: Type[Request], retry_after: float | None = None) -> None:
+        super().__init__(f"{request_type.__name__} request rejected")
+        self.request_type = request_type
+        self.retry_after = retry_after
+
+
+class RateLimitExceeded(AdmissionRejected):
+    ...
+
+
+class Overloaded(AdmissionRejected):
+    ...
+
+
+@dataclass(frozen=True, kw_only=True)
+class AdmissionPolicy:
+    """Limits of a request type.
+
+    ``max_concurrency`` limits requests handled at once, ``rate`` and ``burst`` set a
+    token bucket of requests per second. With ``queue_timeout`` requests wait for
+    a free slot or a token at most that many seconds, with 0 they fail fast.
+    """
+
+    max_concurrency: int | None = None
+    rate: float | None = None
+    burst: int | None = None
+    queue_timeout: float = 0.0
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def reserve(self, max_wait: float) -> float | None:
+        """Take a token and return how long to wait for it, None if longer than max_wait.
+
+        Tokens may be taken in advance, so waiting requests are admitted in order.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        wait = max(0.0, (1 - self._tokens) / self.rate)
+        if wait > max_wait:
+            return None
+        self._tokens -= 1
+        return wait
+
+    def refund(self) -> None:
+        """Return a token taken by a request which was not admitted after all."""
+        self._tokens = min(self.burst, self._tokens + 1)
+
+    def retry_after(self) -> float:
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+
+class _Limiter:
+    def __init__(self, policy: AdmissionPolicy) -> None:
+        self.policy = policy
+        self.semaphore = None
+        if policy.max_concurrency:
+            self.semaphore = asyncio.Semaphore(policy.max_concurrency)
+        self.bucket = None
+        if policy.rate:
+            self.bucket = TokenBucket(policy.rate, policy.burst or max(1, int(policy.rate)))
+
+
+class AdmissionMiddleware(Middleware):
+    """Limits concurrency and rate of requests per request type.
+
+    Rejected requests raise ``RateLimitExceeded`` when the rate is exceeded and
+    ``Overloaded`` when all concurrency slots stay busy. Add it after the caching
+    middlewares, so only requests which are actually handled are limited.
+
+    Usage::
+
+      middleware_chain.add(AdmissionMiddleware({
+          GetUsersQuery: AdmissionPolicy(max_concurrency=50, rate=500, queue_timeout=0.5),
+      }))
+
+    """
+
+    def __init__(
+        self,
+        policies: dict[Type[Request], AdmissionPolicy],
+        default: AdmissionPolicy | None = None,
+    ) -> None:
+        self.admitted = 0
+        self.rejected = 0
+        self._default = default
+        self._limiters = {
+            request_type: _Limiter(policy) for request_type, policy in policies.items()
+        }
+
+    def applies_to(self, request_type: Type[Request]) -> bool:
+        return self._default is not None or request_type in self._limiters
+
+    async def __call__(self, request: Request, handle: HandleType) -> Res:
+        request_type = type(request)
+        limiter = self._limiters.get(request_type)
+        if limiter is None:
+            limiter = self._limiters[request_type] = _Limiter(self._default)
+        queue_timeout = limiter.policy.queue_timeout
+        deadline = time.monotonic() + queue_timeout
+
+        if limiter.bucket is not None:
+            wait = limiter.bucket.reserve(queue_timeout)
+            if wait is None:
+                self._reject(request_type)
+                raise RateLimitExceeded(request_type, limiter.bucket.retry_after())
+            if wait:
+                await asyncio.sleep(wait)
+
+        if limiter.semaphore is None:
+            self.admitted += 1
+            return await handle(request)
+
+        if limiter.semaphore.locked():
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                self._reject(request_type, limiter)
+                raise Overloaded(request_type, queue_timeout or None)
+            try:
+                await asyncio.wait_for(limiter.semaphore.acquire(), timeout)
+            except asyncio.TimeoutError:
+                self._reject(request_type, limiter)
+                raise Overloaded(request_type, queue_timeout) from None
+        else:
+            await limiter.semaphore.acquire()
+
+        self.admitted += 1
+        try:
+            return await handle(request)
+        finally:
+            limiter.semaphore.release()
+
+    def stats(self) -> dict[str, int]:
+        return {"admitted": self.admitted, "rejected": self.rejected}
+
+    def _reject(self, request_type: Type[Request], limiter: _Limiter | None = None) -> None:
+        # a request rejected for concurrency must not use up the rate budget
+        if limiter is not None and limiter.bucket is not None:
+            limiter.bucket.refund()
+        self.rejected += 1
+        logger.debug("%s request rejected by admission control", request_type.__name__)
@@ -0,0 +1,107 @@
+import abc
+import asyncio
+import logging
+from typing import Any, Generic, TypeVar
+
+from app.seedwork.application.mediator.request import RequestHandler
+from app.seedwork.application.messages import Request, Response
+
+logger = logging.getLogger(__name__)
+
+Req = TypeVar("Req", bound=Request, contravariant=True)
+Res = TypeVar("Res", Response, None, covariant=True)
+
+
+class BatchRequestHandler(RequestHandler[Req, Res], abc.ABC):
+    """The request handler, which handles requests sent in the same loop tick at once.
+
+    Requests go through the mediator and middlewares one by one as usual, but instead
+    of handling each of them the handler puts it into a batch of its type. The batch
+    is passed to ``handle_batch`` of one of the handlers on the next loop iteration,
+    and every sender gets the response at the same position.
+
+    Usage::
+
+      class ReadMeetingsByIdsQueryHandler(
+          BatchRequestHandler[ReadMeetingsByIdsQuery, ReadMeetingsByIdsQueryResult]
+      ):
+          async def handle_batch(
+              self, requests: list[ReadMeetingsByIdsQuery]
+          ) -> list[ReadMeetingsByIdsQueryResult]:
+              meetings = await self._meetings_api.get_many(
+                  {meeting_id for request in requests for meeting_id in request.meeting_ids}
+              )
+              return [
+                  ReadMeetingsByIdsQueryResult(meetings=[meetings[id] for id in request.meeting_ids])
+                  for request in requests
+              ]
+
+      # both are handled by a single handle_batch call
+      await asyncio.gather(
+          mediator.send(ReadMeetingsByIdsQuery(meeting_ids=[1])),
+          mediator.send(ReadMeetingsByIdsQuery(meeting_ids=[2, 3])),
+      )
+
+    """
+
+    max_batch_size: int = 100
+
+    _batcher: "RequestBatcher"
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # handlers are created per request, so the batch is kept per handler type
+        cls._batcher = RequestBatcher(cls.max_batch_size)
+
+    async def handle(self, request: Req) -> Res:
+        return await self._batcher.load(self, request)
+
+    @abc.abstractmethod
+    async def handle_batch(self, requests: list[Req]) -> list[Res]:
+        """Return responses in the order of requests."""
+        raise NotImplementedError
+
+
+class RequestBatcher(Generic[Req, Res]):
+    """Collects requests of a loop tick and runs them through ``handle_batch``."""
+
+    def __init__(self, max_batch_size: int = 100) -> None:
+        self.max_batch_size = max_batch_size
+        self._pending: list[tuple[BatchRequestHandler, Req, asyncio.Future]] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    def load(self, handler: BatchRequestHandler, request: Req) -> "asyncio.Future[Res]":
+        loop = asyncio.get_running_loop()
+        if not self._pending:
+            loop.call_soon(self._dispatch)
+        future = loop.create_future()
+        self._pending.append((handler, request, future))
+        return future
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.max_batch_size):
+            task = asyncio.create_task(self._run(pending[start:start + self.max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _run(batch: list[tuple[BatchRequestHandler, Req, asyncio.Future]]) -> None:
+        handler = batch[0][0]
+        try:
+            responses = await handler.handle_batch([request for _, request, _ in batch])
+            if len(responses) != len(batch):
+                raise ValueError(
+                    f"{type(handler).__name__} returned {len(responses)} responses "
+                    f"for {len(batch)} requests"
+                )
+        except Exception as exc:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        logger.debug("%d %s requests handled in a batch", len(batch), type(batch[0][1]).__name__)
+        for (_, _, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
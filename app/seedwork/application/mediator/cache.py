@@ -0,0 +1,163 @@
+import dataclasses
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from typing import Hashable, Type
+
+from app.seedwork.application.mediator.events.event_handler import EventHandler
+from app.seedwork.application.mediator.middlewares import HandleType, Middleware, Res
+from app.seedwork.application.messages import DomainEvent, Request, Response
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(request: Request) -> Hashable:
+    """Key of equal requests: request type and all fields except request_id.
+
+    :raises TypeError when some field is not hashable
+    """
+    key = (type(request),) + tuple(
+        getattr(request, field.name)
+        for field in dataclasses.fields(request)
+        if field.name != "request_id"
+    )
+    hash(key)
+    return key
+
+
+class QueryCache:
+    """LRU cache of query responses with TTL and event based invalidation.
+
+    Usage::
+
+      query_cache = QueryCache(max_size=1024, ttl=60)
+      query_cache.register(GetUsersQuery, invalidated_by=[UserCreatedEvent])
+
+      middleware_chain.add(CachingMiddleware(query_cache))
+      for event_type in query_cache.invalidating_events:
+          event_map.bind(event_type, QueryCacheInvalidator)
+
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Response | None]] = OrderedDict()
+        self._request_types: set[Type[Request]] = set()
+        self._invalidated_by: dict[Type[DomainEvent], set[Type[Request]]] = defaultdict(set)
+        self._generations: dict[Type[Request], int] = defaultdict(int)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def invalidating_events(self) -> list[Type[DomainEvent]]:
+        return list(self._invalidated_by)
+
+    def register(
+        self,
+        request_type: Type[Request],
+        invalidated_by: list[Type[DomainEvent]],
+        cached: bool = True,
+    ) -> None:
+        """Cache responses of the request type until one of the events is emitted.
+
+        With ``cached`` false responses are not stored, the events only change the
+        generation of the request type, which single flight uses.
+        """
+        if cached:
+            self._request_types.add(request_type)
+        for event_type in invalidated_by:
+            self._invalidated_by[event_type].add(request_type)
+
+    def is_cached(self, request_type: Type[Request]) -> bool:
+        return request_type in self._request_types
+
+    def get(self, key: Hashable) -> tuple[bool, Response | None]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def generation(self, request_type: Type[Request]) -> int:
+        return self._generations[request_type]
+
+    def put(
+        self, key: Hashable, response: Response | None, generation: int
+    ) -> None:
+        """Store response computed when the request type had the passed generation.
+
+        If the cache was invalidated in the meantime the response may be stale and is dropped.
+        """
+        if generation != self._generations[key[0]]:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, event_type: Type[DomainEvent]) -> None:
+        request_types = self._invalidated_by.get(event_type)
+        if not request_types:
+            return
+        for request_type in request_types:
+            self._generations[request_type] += 1
+        for key in [key for key in self._entries if key[0] in request_types]:
+            del self._entries[key]
+        self.invalidations += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class CachingMiddleware(Middleware):
+    """Returns cached responses of requests registered in the query cache."""
+
+    def __init__(self, cache: QueryCache) -> None:
+        self._cache = cache
+
+    def applies_to(self, request_type: Type[Request]) -> bool:
+        return self._cache.is_cached(request_type)
+
+    async def __call__(self, request: Request, handle: HandleType) -> Res:
+        if not self._cache.is_cached(type(request)):
+            return await handle(request)
+
+        try:
+            key = request_key(request)
+        except TypeError:
+            return await handle(request)
+
+        found, response = self._cache.get(key)
+        if found:
+            return response
+
+        generation = self._cache.generation(type(request))
+        response = await handle(request)
+        self._cache.put(key, response, generation)
+        return response
+
+
+class QueryCacheInvalidator(EventHandler[DomainEvent]):
+    """Drops cached responses of queries registered as invalidated by the event."""
+
+    def __init__(self, cache: QueryCache) -> None:
+        self._cache = cache
+
+    async def handle(self, event: DomainEvent) -> None:
+        logger.debug("Invalidate query cache by %s", type(event).__name__)
+        self._cache.invalidate(type(event))
@@ -21,7 +21,8 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
-from typing import Protocol, Type, TypeVar
+import functools
+from typing import Callable, Protocol, Type, TypeVar
 
 import rodi
 
@@ -44,10 +45,22 @@ class Container(Protocol[C]):
     async def resolve(self, type_: Type[T]) -> T:
         ...
 
+    def freeze(self) -> None:
+        """Compile registered dependencies, nothing can be registered after that."""
+        ...
+
+    def get_activator(self, type_: Type[T]) -> Callable[[], T]:
+        """Return a function building the type, available after freeze.
+
+        :raises UnresolvableDependency when the type can't be built
+        """
+        ...
+
 
 class RodiContainer(Container[rodi.Container]):
     def __init__(self, external_container: rodi.Container | None = None) -> None:
         self._external_container: rodi.Container | None = external_container
+        self._services: rodi.Services | None = None
 
     @property
     def external_container(self) -> rodi.Container:
@@ -58,12 +71,31 @@ class RodiContainer(Container[rodi.Container]):
 
     def attach_external_container(self, container: rodi.Container) -> None:
         self._external_container = container
+        self._services = None
 
     async def resolve(self, type_: Type[T]) -> T:
+        if self._services is not None:
+            return self._services.get(type_)
         if hasattr(self.external_container, "resolve"):
             return self.external_container.resolve(type_)
         return self._build_by_provider(type_)
 
+    def freeze(self) -> None:
+        # rodi checks that dependencies of all registered types can be resolved here,
+        # the provider is shared with the container, so singletons are the same instances
+        self._services = self.external_container.provider
+
+    def get_activator(self, type_: Type[T]) -> Callable[[], T]:
+        if self._services is None:
+            raise RuntimeError("Container must be frozen before getting activators.")
+        if type_ not in self._services:
+            raise UnresolvableDependency(f"{type_.__name__} is not registered in the container.")
+        return functools.partial(self._services.get, type_)
+
     def _build_by_provider(self, type_: Type[T]) -> T:
         services = self.external_container.build_provider()
         return services.get(type_)
+
+
+class UnresolvableDependency(Exception):
+    ...
@@ -23,11 +23,17 @@ SOFTWARE.
 """
 import abc
 from dataclasses import dataclass, field
+from typing import Callable, Type
 
 from app.seedwork.application.mediator.container import Container
 from app.seedwork.application.mediator.middlewares import MiddlewareChain
-from app.seedwork.application.mediator.request import RequestMap
+from app.seedwork.application.mediator.request import (
+    RequestHandler,
+    RequestHandlerDoesNotExist,
+    RequestMap,
+)
 from app.seedwork.application.messages import Event, Request, Response
+from app.seedwork.infrastructure import tracing
 
 
 @dataclass
@@ -40,6 +46,9 @@ class Dispatcher(abc.ABC):
     async def dispatch(self, request: Request) -> DispatchResult:
         ...
 
+    def freeze(self) -> None:
+        """Prepare dispatching when all handlers are registered."""
+
 
 class DefaultDispatcher(Dispatcher):
     def __init__(
@@ -51,14 +60,37 @@ class DefaultDispatcher(Dispatcher):
         self._request_map = request_map
         self._container = container
         self._middleware_chain = middleware_chain or MiddlewareChain()
+        self._activators: dict[Type[Request], Callable[[], RequestHandler]] | None = None
 
-    async def dispatch(self, request: Request) -> DispatchResult:
-        handler_type = self._request_map.get(type(request))
-
-        handler = await self._container.resolve(handler_type)
+    def freeze(self) -> None:
+        """Build request type -> handler activator table.
 
-        wrapped_handle = self._middleware_chain.wrap(handler.handle)
+        :raises UnresolvableDependency when some handler can't be resolved
+        """
+        self._request_map.freeze()
+        self._activators = {
+            request_type: self._container.get_activator(self._request_map.get(request_type))
+            for request_type in self._request_map.get_requests()
+        }
 
-        response = await wrapped_handle(request)
+    async def dispatch(self, request: Request) -> DispatchResult:
+        with tracing.span("mediator.dispatch", request=type(request).__name__):
+            return await self._dispatch(request)
+
+    async def _dispatch(self, request: Request) -> DispatchResult:
+        if self._activators is not None:
+            activator = self._activators.get(type(request))
+            if activator is None:
+                raise RequestHandlerDoesNotExist(
+                    "RequestHandler not found matching Request type."
+                )
+            handler = activator()
+        else:
+            handler_type = self._request_map.get(type(request))
+            handler = await self._container.resolve(handler_type)
+
+        pipeline = self._middleware_chain.pipeline(type(request))
+
+        response = await pipeline(handler, request)
 
         return DispatchResult(response=response, events=handler.events)
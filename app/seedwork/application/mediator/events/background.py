@@ -0,0 +1,187 @@
+import asyncio
+import contextvars
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Type
+
+from app.seedwork.application.mediator.events.event_handler import EventHandler
+from app.seedwork.application.messages import DomainEvent
+from app.seedwork.infrastructure.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+HandleFunc = Callable[[DomainEvent, Type[EventHandler]], Awaitable[None]]
+
+
+@dataclass(frozen=True, slots=True)
+class DeadLetter:
+    event: DomainEvent
+    handler_type: Type[EventHandler]
+    error: Exception | None
+    attempts: int
+
+
+@dataclass(frozen=True, slots=True)
+class _Job:
+    event: DomainEvent
+    handler_type: Type[EventHandler]
+    handle: HandleFunc
+    # context of the submitter, so the handler continues its trace
+    context: contextvars.Context
+
+
+class BackgroundEventDispatcher:
+    """Runs deferred event handlers in a pool of workers after the request is done.
+
+    Jobs are put into a bounded queue, so when workers fall behind submitting waits for
+    a free slot. A failed handler is retried with exponential backoff, after the last
+    attempt the job goes to ``dead_letters``. On stop the queue is drained for at most
+    ``drain_timeout`` seconds, jobs left after that, queued or running, are dead-lettered too.
+    Only the latest ``max_dead_letters`` are kept in memory, all of them are counted
+    in ``dead_lettered`` and, with ``metrics``, in ``event_dead_letters_total``.
+
+    Until started (e.g. in scripts without lifespan) handlers are run inline.
+
+    Usage::
+
+      dispatcher = BackgroundEventDispatcher(workers=4)
+      event_emitter = EventEmitter(event_map, container, background_dispatcher=dispatcher)
+
+      dispatcher.start()
+      ...
+      await dispatcher.stop()
+
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        queue_size: int = 1000,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        drain_timeout: float = 10.0,
+        max_dead_letters: int = 1000,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.drain_timeout = drain_timeout
+        self.dead_letters: deque[DeadLetter] = deque(maxlen=max_dead_letters)
+        self.dead_lettered = 0
+        self._dead_letters_total = None
+        if metrics is not None:
+            self._dead_letters_total = metrics.counter(
+                "event_dead_letters_total",
+                "Deferred event handlers which failed all attempts or were not run.",
+                ["event", "handler"],
+            )
+        self._queue_size = queue_size
+        self._queue: asyncio.Queue[_Job] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start workers, must be called from the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(self._queue_size)
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"event-worker-{idx}")
+            for idx in range(self.workers)
+        ]
+        logger.info("Background event dispatcher started with %d workers", self.workers)
+
+    async def stop(self) -> None:
+        """Wait until the queued jobs are done and stop workers."""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Deferred event handlers were not drained in %ss, %d queued are dead-lettered",
+                self.drain_timeout,
+                self._queue.qsize(),
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            self._dead_letter(DeadLetter(job.event, job.handler_type, None, 0))
+        if self.dead_lettered:
+            logger.warning(
+                "Background event dispatcher stopped, %d jobs were dead-lettered",
+                self.dead_lettered,
+            )
+        else:
+            logger.info("Background event dispatcher stopped")
+
+    async def submit(
+        self, event: DomainEvent, handler_type: Type[EventHandler], handle: HandleFunc
+    ) -> None:
+        """Queue handling of the event by the handler with the passed function."""
+        if not self.running:
+            await handle(event, handler_type)
+            return
+        await self._queue.put(_Job(event, handler_type, handle, contextvars.copy_context()))
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: _Job) -> None:
+        attempt = 0
+        error: Exception | None = None
+        try:
+            for attempt in range(1, self.max_retries + 2):
+                try:
+                    await asyncio.create_task(
+                        job.handle(job.event, job.handler_type), context=job.context
+                    )
+                    return
+                except Exception as exc:
+                    error = exc
+                    if attempt > self.max_retries:
+                        logger.exception(
+                            "Deferred event handler(%s) failed to handle Event(%s), dead-lettered",
+                            job.handler_type.__name__,
+                            type(job.event).__name__,
+                        )
+                        self._dead_letter(DeadLetter(job.event, job.handler_type, exc, attempt))
+                        return
+                    logger.warning(
+                        "Deferred event handler(%s) failed (attempt %d), retrying: %r",
+                        job.handler_type.__name__,
+                        attempt,
+                        exc,
+                    )
+                    await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+        except asyncio.CancelledError:
+            # stopped after the drain timeout while the job was running or waiting to retry
+            logger.warning(
+                "Deferred event handler(%s) was cancelled on stop, Event(%s) dead-lettered",
+                job.handler_type.__name__,
+                type(job.event).__name__,
+            )
+            self._dead_letter(DeadLetter(job.event, job.handler_type, error, attempt))
+            raise
+
+    def _dead_letter(self, letter: DeadLetter) -> None:
+        self.dead_letters.append(letter)
+        self.dead_lettered += 1
+        if self._dead_letters_total is not None:
+            self._dead_letters_total.inc(
+                type(letter.event).__name__, letter.handler_type.__name__
+            )
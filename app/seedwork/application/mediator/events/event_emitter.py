@@ -1,7 +1,12 @@
+import asyncio
 import logging
+import time
 from functools import singledispatchmethod
+from typing import Callable, Type
 
 from app.seedwork.application.mediator.container import Container
+from app.seedwork.application.mediator.events.background import BackgroundEventDispatcher
+from app.seedwork.application.mediator.events.event_handler import EventHandler
 from app.seedwork.application.mediator.events.map import EventMap
 from app.seedwork.application.mediator.message_brokers import Message, MessageBroker
 from app.seedwork.application.messages import (
@@ -10,7 +15,9 @@ from app.seedwork.application.messages import (
     Event,
     NotificationEvent,
 )
+from app.seedwork.infrastructure import tracing
 from app.seedwork.infrastructure.encoders import jsonable_encoder
+from app.seedwork.infrastructure.metrics import MetricsRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +42,14 @@ class EventEmitter:
       # Sends event to the Redis Pub/Sub:
       await event_emitter.emit(user_joined_notification_event)
 
+    With ``concurrent=True`` handlers of a domain event run concurrently, a handler
+    can declare handlers it must run after in ``depends_on``, and events of a request
+    are emitted at most ``max_concurrent_events`` at a time. ``handler_timeout``
+    limits time of every handler.
+
+    Handlers and event types marked as ``deferred`` are passed to the background
+    dispatcher, so the request doesn't wait for them.
+
     """
 
     def __init__(
@@ -42,10 +57,46 @@ class EventEmitter:
         event_map: EventMap,
         container: Container,
         message_broker: MessageBroker | None = None,
+        *,
+        concurrent: bool = False,
+        max_concurrent_events: int = 10,
+        handler_timeout: float | None = None,
+        background_dispatcher: BackgroundEventDispatcher | None = None,
+        metrics: MetricsRegistry | None = None,
     ) -> None:
         self._event_map = event_map
         self._container = container
         self._message_broker = message_broker
+        self._concurrent = concurrent
+        self._max_concurrent_events = max_concurrent_events
+        self._handler_timeout = handler_timeout
+        self._background_dispatcher = background_dispatcher
+        self._handler_duration = None
+        self._handler_errors = None
+        if metrics is not None:
+            self._handler_duration = metrics.histogram(
+                "event_handler_duration_seconds",
+                "Time of handling domain events.",
+                ["event", "handler"],
+            )
+            self._handler_errors = metrics.counter(
+                "event_handler_errors_total",
+                "Domain event handlers failed with an exception.",
+                ["event", "handler"],
+            )
+        self._activators: dict[Type[EventHandler], Callable[[], EventHandler]] | None = None
+
+    def freeze(self) -> None:
+        """Build handler type -> activator table.
+
+        :raises UnresolvableDependency when some handler can't be resolved
+        """
+        self._event_map.freeze()
+        self._activators = {
+            handler_type: self._container.get_activator(handler_type)
+            for event_type in self._event_map.get_events()
+            for handler_type in self._event_map.get(event_type)
+        }
 
     @singledispatchmethod
     async def emit(self, event: Event) -> None:
@@ -55,14 +106,145 @@ class EventEmitter:
     async def _(self, event: DomainEvent) -> None:
         handlers_types = self._event_map.get(type(event))
 
+        if self._background_dispatcher is not None:
+            deferred = [
+                handler_type
+                for handler_type in handlers_types
+                if event.deferred or getattr(handler_type, "deferred", False)
+            ]
+            for handler_type in deferred:
+                await self._background_dispatcher.submit(event, handler_type, self._handle)
+            if deferred:
+                handlers_types = [
+                    handler_type for handler_type in handlers_types if handler_type not in deferred
+                ]
+
+        if self._concurrent and len(handlers_types) > 1:
+            await self._handle_concurrently(event, handlers_types)
+            return
+
         for handler_type in handlers_types:
-            handler = await self._container.resolve(handler_type)
-            logger.debug(
-                "Handling Event(%s) via event handler(%s)",
-                type(event).__name__,
-                handler_type.__name__,
+            await self._handle(event, handler_type)
+
+    async def emit_many(self, events: list[Event]) -> None:
+        """Emit events one by one, in the concurrent mode max_concurrent_events at a time.
+
+        :raises ExceptionGroup when some events failed in the concurrent mode
+        """
+        if not self._concurrent or len(events) < 2:
+            for event in events:
+                await self.emit(event)
+            return
+
+        errors: list[Exception] = []
+        pending = iter(events)
+
+        async def _worker() -> None:
+            # workers share the iterator, so every event is emitted exactly once
+            for event in pending:
+                try:
+                    await self.emit(event)
+                except Exception as exc:
+                    errors.append(exc)
+
+        await asyncio.gather(
+            *(_worker() for _ in range(min(self._max_concurrent_events, len(events))))
+        )
+        if errors:
+            raise ExceptionGroup("Failed to emit events", errors)
+
+    async def _handle_concurrently(
+        self, event: DomainEvent, handlers_types: list[Type[EventHandler]]
+    ) -> None:
+        """Run handlers concurrently in waves ordered by their ``depends_on``.
+
+        A failed handler does not stop the others, but handlers depending on it are
+        skipped. Failures are raised together when all handlers are done.
+        """
+        pending = list(handlers_types)
+        failed: set[Type[EventHandler]] = set()
+        errors: list[Exception] = []
+
+        while pending:
+            wave = [
+                handler_type
+                for handler_type in pending
+                if not any(
+                    dependency in pending
+                    for dependency in getattr(handler_type, "depends_on", ())
+                )
+            ]
+            if not wave:
+                raise RuntimeError(
+                    f"Event handlers of {type(event).__name__} have cyclic dependencies."
+                )
+
+            runnable = []
+            for handler_type in wave:
+                pending.remove(handler_type)
+                if any(
+                    dependency in failed
+                    for dependency in getattr(handler_type, "depends_on", ())
+                ):
+                    logger.error(
+                        "Skip event handler(%s), its dependency failed", handler_type.__name__
+                    )
+                    failed.add(handler_type)
+                else:
+                    runnable.append(handler_type)
+
+            results = await asyncio.gather(
+                *(self._handle(event, handler_type) for handler_type in runnable),
+                return_exceptions=True,
             )
-            await handler.handle(event)
+            for handler_type, result in zip(runnable, results):
+                if isinstance(result, Exception):
+                    logger.error(
+                        "Event handler(%s) failed to handle Event(%s)",
+                        handler_type.__name__,
+                        type(event).__name__,
+                        exc_info=result,
+                    )
+                    failed.add(handler_type)
+                    errors.append(result)
+
+        if errors:
+            raise ExceptionGroup(f"Failed to handle {type(event).__name__}", errors)
+
+    async def _handle(self, event: DomainEvent, handler_type: Type[EventHandler]) -> None:
+        if self._handler_duration is None:
+            await self._run_handler(event, handler_type)
+            return
+
+        started = time.perf_counter()
+        labels = (type(event).__name__, handler_type.__name__)
+        try:
+            await self._run_handler(event, handler_type)
+        except Exception:
+            self._handler_errors.inc(*labels)
+            raise
+        finally:
+            self._handler_duration.observe(time.perf_counter() - started, *labels)
+
+    async def _run_handler(self, event: DomainEvent, handler_type: Type[EventHandler]) -> None:
+        handler = await self._resolve(handler_type)
+        logger.debug(
+            "Handling Event(%s) via event handler(%s)",
+            type(event).__name__,
+            handler_type.__name__,
+        )
+        with tracing.span(
+            "event_handler", event=type(event).__name__, handler=handler_type.__name__
+        ):
+            if self._handler_timeout is None:
+                await handler.handle(event)
+            else:
+                await asyncio.wait_for(handler.handle(event), self._handler_timeout)
+
+    async def _resolve(self, handler_type: Type[EventHandler]) -> EventHandler:
+        if self._activators is not None:
+            return self._activators[handler_type]()
+        return await self._container.resolve(handler_type)
 
     @emit.register
     async def _(self, event: NotificationEvent) -> None:
@@ -71,15 +253,16 @@ class EventEmitter:
                 "To use NotificationEvent, message_broker argument must be specified."
             )
 
-        message = _build_message(event)
+        with tracing.span("event_emitter.emit", event=type(event).__name__):
+            message = _build_message(event)
 
-        logger.debug(
-            "Sending Notification Event(%s) to message broker %s",
-            event.event_id,
-            type(self._message_broker).__name__,
-        )
+            logger.debug(
+                "Sending Notification Event(%s) to message broker %s",
+                event.event_id,
+                type(self._message_broker).__name__,
+            )
 
-        await self._message_broker.send_message(message)
+            await self._message_broker.send_message(message)
 
     @emit.register
     async def _(self, event: ECSTEvent) -> None:
@@ -88,15 +271,16 @@ class EventEmitter:
                 "To use ECSTEvent, message_broker argument must be specified."
             )
 
-        message = _build_message(event)
+        with tracing.span("event_emitter.emit", event=type(event).__name__):
+            message = _build_message(event)
 
-        logger.debug(
-            "Sending ECST event(%s) to message broker %s",
-            event.event_id,
-            type(self._message_broker).__name__,
-        )
+            logger.debug(
+                "Sending ECST event(%s) to message broker %s",
+                event.event_id,
+                type(self._message_broker).__name__,
+            )
 
-        await self._message_broker.send_message(message)
+            await self._message_broker.send_message(message)
 
 
 def _build_message(event: NotificationEvent | ECSTEvent) -> Message:
@@ -106,4 +290,6 @@ def _build_message(event: NotificationEvent | ECSTEvent) -> Message:
         message_name=type(event).__name__,
         message_id=event.event_id,
         payload=payload,
+        # lets consumers continue the trace
+        metadata=tracing.inject({}),
     )
@@ -19,7 +19,14 @@ class EventHandler(Protocol[E]):
           async def handle(self, event: UserJoinedEventHandler) -> None:
               await self._meetings_api.notify_room(event.meeting_id, "New user joined!")
 
+    When event handlers run concurrently, handlers listed in ``depends_on`` which
+    handle the same event are run and succeed before this one. Set ``deferred`` to
+    run the handler in background after the response is sent.
     """
+
+    depends_on: tuple[type, ...] = ()
+    deferred: bool = False
+
     @abc.abstractmethod
     async def handle(self, event: E) -> None:
         raise NotImplementedError
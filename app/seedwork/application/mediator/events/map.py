@@ -12,14 +12,20 @@ class EventMap:
         self._event_map: dict[
             Type[DomainEvent], list[Callable[[], EventHandler]]
         ] = defaultdict(lambda: [])
+        self._frozen = False
 
     def bind(
         self, event_type: Type[E], handler_type: Callable[[], EventHandler[E]]
     ) -> None:
+        if self._frozen:
+            raise RuntimeError("EventMap is frozen, handlers must be bound before freeze.")
         self._event_map[event_type].append(handler_type)
 
+    def freeze(self) -> None:
+        self._frozen = True
+
     def get(self, event_type: Type[E]) -> list[Callable[[], EventHandler[E]]]:
-        return self._event_map[event_type]
+        return self._event_map.get(event_type, [])
 
     def get_events(self) -> list[Type[DomainEvent]]:
         return list(self._event_map.keys())
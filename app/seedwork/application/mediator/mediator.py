@@ -21,7 +21,8 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
-from typing import Type
+import asyncio
+from typing import Iterable, Type
 
 from app.seedwork.application.mediator.container import Container
 from app.seedwork.application.mediator.dispatcher import DefaultDispatcher, Dispatcher
@@ -29,6 +30,7 @@ from app.seedwork.application.mediator.events.event_emitter import EventEmitter
 from app.seedwork.application.mediator.middlewares import MiddlewareChain
 from app.seedwork.application.mediator.request import RequestMap
 from app.seedwork.application.messages import Event, Request, Response
+from app.seedwork.infrastructure import tracing
 
 
 class Mediator:
@@ -69,15 +71,62 @@ class Mediator:
             request_map=request_map, container=container, middleware_chain=middleware_chain  # type: ignore
         )
 
+    def freeze(self) -> None:
+        """Freeze the dispatch plan, call it when all modules are registered.
+
+        Request and event handlers are looked up in prepared tables after that and
+        handlers which can't be resolved fail here instead of on the first request.
+
+        :raises UnresolvableDependency when some handler can't be resolved
+        """
+        self._dispatcher.freeze()
+        self._event_emitter.freeze()
+
     async def send(self, request: Request) -> Response | None:
-        dispatch_result = await self._dispatcher.dispatch(request)
+        # the span covers handling of the request and its events
+        with tracing.span("mediator.send", request=type(request).__name__):
+            dispatch_result = await self._dispatcher.dispatch(request)
 
-        if dispatch_result.events:
-            await self._send_events(dispatch_result.events.copy())
+            if dispatch_result.events:
+                await self._send_events(dispatch_result.events.copy())
 
         return dispatch_result.response
 
+    async def send_many(
+        self, requests: Iterable[Request], max_concurrency: int = 10
+    ) -> list[Response | None | Exception]:
+        """Send requests concurrently, at most max_concurrency at a time.
+
+        Results are in the order of requests. A failed request does not abort the
+        others, its exception is returned in place of the response. Events are emitted
+        per request as with send.
+
+        Usage::
+
+          results = await mediator.send_many(
+              [ReadMeetingByIdQuery(meeting_id=meeting_id) for meeting_id in meeting_ids],
+              max_concurrency=20,
+          )
+
+        :raises ValueError when max_concurrency is less than 1
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        requests = list(requests)
+        results: list[Response | None | Exception] = [None] * len(requests)
+        pending = iter(enumerate(requests))
+
+        async def _worker() -> None:
+            # workers share the iterator, so every request is sent exactly once
+            for idx, request in pending:
+                try:
+                    results[idx] = await self.send(request)
+                except Exception as exc:
+                    results[idx] = exc
+
+        await asyncio.gather(*(_worker() for _ in range(min(max_concurrency, len(requests)))))
+        return results
+
     async def _send_events(self, events: list[Event]) -> None:
-        while events:
-            event = events.pop()
-            await self._event_emitter.emit(event)
+        events.reverse()
+        await self._event_emitter.emit_many(events)
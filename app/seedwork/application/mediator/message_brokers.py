@@ -24,12 +24,15 @@ SOFTWARE.
 import abc
 import json
 import logging
+import time
 from dataclasses import dataclass, field
 from uuid import UUID, uuid4
 
 from redis.asyncio import Redis
 
+from app.seedwork.infrastructure import tracing
 from app.seedwork.infrastructure.encoders import jsonable_encoder
+from app.seedwork.infrastructure.metrics import MetricsRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +43,7 @@ class Message:
     message_name: str = field()
     message_id: UUID = field(default_factory=uuid4)
     payload: dict = field()
+    metadata: dict[str, str] = field(default_factory=dict)
 
 
 class MessageBroker(abc.ABC):
@@ -53,6 +57,36 @@ class MessageBroker(abc.ABC):
         ...
 
 
+class MeasuredMessageBroker(MessageBroker):
+    """Records time and errors of sending messages by the wrapped broker."""
+
+    def __init__(self, broker: MessageBroker, metrics: MetricsRegistry) -> None:
+        self._broker = broker
+        self._broker_name = type(broker).__name__
+        self._duration = metrics.histogram(
+            "message_broker_send_duration_seconds",
+            "Time of sending messages to the message broker.",
+            ["broker", "message"],
+        )
+        self._errors = metrics.counter(
+            "message_broker_send_errors_total",
+            "Messages failed to be sent.",
+            ["broker", "message"],
+        )
+
+    async def send_message(self, message: Message) -> None:
+        started = time.perf_counter()
+        try:
+            await self._broker.send_message(message)
+        except Exception:
+            self._errors.inc(self._broker_name, message.message_name)
+            raise
+        finally:
+            self._duration.observe(
+                time.perf_counter() - started, self._broker_name, message.message_name
+            )
+
+
 class StubMessageBroker(MessageBroker):
     async def send_message(self, message: Message) -> None:
         logger.debug(
@@ -66,12 +100,10 @@ class RedisMessageBroker(MessageBroker):
         self._channel_prefix = channel_prefix or "app"
 
     async def send_message(self, message: Message) -> None:
-        async with self._client.pubsub() as pubsub:
-            channel = (
-                f"{self._channel_prefix}:{message.message_type}:{message.message_id}"
-            )
-
-            await pubsub.subscribe(channel)
+        channel = f"{self._channel_prefix}:{message.message_type}:{message.message_id}"
+        with tracing.span("message_broker.send", channel=channel):
+            async with self._client.pubsub() as pubsub:
+                await pubsub.subscribe(channel)
 
-            logger.debug("Sending message to Redis Pub/Sub %s.", message.message_id)
-            await self._client.publish(channel, json.dumps(jsonable_encoder(message)))
+                logger.debug("Sending message to Redis Pub/Sub %s.", message.message_id)
+                await self._client.publish(channel, json.dumps(jsonable_encoder(message)))
@@ -0,0 +1,74 @@
+import time
+
+from app.seedwork.application.mediator.cache import QueryCache
+from app.seedwork.application.mediator.middlewares import HandleType, Middleware, Res
+from app.seedwork.application.mediator.single_flight import SingleFlightMiddleware
+from app.seedwork.application.messages import Request
+from app.seedwork.infrastructure.metrics import MetricsRegistry
+
+
+class MetricsMiddleware(Middleware):
+    """Records latency and errors of requests per request type.
+
+    Add it first, so the time spent in other middlewares is included.
+    """
+
+    def __init__(self, metrics: MetricsRegistry) -> None:
+        self._duration = metrics.histogram(
+            "mediator_request_duration_seconds",
+            "Time of handling requests by the mediator.",
+            ["request"],
+        )
+        self._errors = metrics.counter(
+            "mediator_request_errors_total",
+            "Requests failed with an exception.",
+            ["request", "error"],
+        )
+
+    async def __call__(self, request: Request, handle: HandleType) -> Res:
+        started = time.perf_counter()
+        try:
+            return await handle(request)
+        except Exception as exc:
+            self._errors.inc(type(request).__name__, type(exc).__name__)
+            raise
+        finally:
+            self._duration.observe(time.perf_counter() - started, type(request).__name__)
+
+
+def register_query_cache_metrics(metrics: MetricsRegistry, cache: QueryCache) -> None:
+    """Export counters the query cache keeps."""
+    metrics.callback("query_cache_size", "Cached responses.", lambda: len(cache))
+    for name, documentation in (
+        ("hits", "Requests answered from the cache."),
+        ("misses", "Requests not found in the cache."),
+        ("evictions", "Responses evicted to keep the size limit."),
+        ("invalidations", "Invalidations by domain events."),
+    ):
+        metrics.callback(
+            f"query_cache_{name}_total",
+            documentation,
+            lambda name=name: getattr(cache, name),
+            type="counter",
+        )
+
+
+def register_single_flight_metrics(
+    metrics: MetricsRegistry, single_flight: SingleFlightMiddleware
+) -> None:
+    """Export counters the single flight middleware keeps."""
+    metrics.callback(
+        "single_flight_in_flight",
+        "Queries in flight which equal queries can join.",
+        lambda: single_flight.in_flight,
+    )
+    for name, documentation in (
+        ("calls", "Queries passed through single flight."),
+        ("coalesced", "Queries which joined an equal query in flight."),
+    ):
+        metrics.callback(
+            f"single_flight_{name}_total",
+            documentation,
+            lambda name=name: getattr(single_flight, name),
+            type="counter",
+        )
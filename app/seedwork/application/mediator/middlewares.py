@@ -24,9 +24,14 @@ SOFTWARE.
 import abc
 import functools
 import logging
-from typing import Awaitable, Callable, Mapping, Protocol, TypeVar
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Awaitable, Callable, Mapping, Protocol, Type, TypeVar
 
 from app.seedwork.application.messages import Request, Response
+from app.seedwork.infrastructure import tracing
+
+if TYPE_CHECKING:
+    from app.seedwork.application.mediator.request import RequestHandler
 
 Req = TypeVar("Req", bound=Request, contravariant=True)
 Res = TypeVar("Res", Response, None, covariant=True)
@@ -38,19 +43,42 @@ class Middleware(abc.ABC):
     async def __call__(self, request: Request, handle: HandleType) -> Res:
         ...
 
+    def applies_to(self, request_type: Type[Request]) -> bool:
+        """Whether the middleware is included into pipelines of the request type."""
+        return True
+
 
 Handle = Callable[[Req], Awaitable[Res]]
+Pipeline = Callable[["RequestHandler", Req], Awaitable[Res]]
+
+# handler of the request going through a compiled pipeline
+_current_handler: ContextVar["RequestHandler"] = ContextVar("current_handler")
 
 
 class MiddlewareChain:
+    """Chain of middlewares wrapping request handlers.
+
+    Pipelines are compiled once per request type (so per handler type) and cached
+    until the chain is changed. The handler is passed to the innermost call through
+    a context variable, so running a request allocates nothing per middleware.
+    Pipelines compiled while a tracer is installed wrap middlewares into spans, they
+    are cached apart, so installing a tracer later still records middleware spans.
+    """
+
     def __init__(self) -> None:
         self._chain: list[Middleware] = []
+        self._pipelines: dict[Type[Request], Pipeline] = {}
+        self._traced_pipelines: dict[Type[Request], Pipeline] = {}
 
     def set(self, chain: list[Middleware]) -> None:
-        self._chain = chain
+        self._chain = list(chain)
+        self._pipelines.clear()
+        self._traced_pipelines.clear()
 
     def add(self, middleware: Middleware) -> None:
         self._chain.append(middleware)
+        self._pipelines.clear()
+        self._traced_pipelines.clear()
 
     def wrap(self, handle: Handle) -> Handle:
         for middleware in reversed(self._chain):
@@ -58,6 +86,56 @@ class MiddlewareChain:
 
         return handle
 
+    def pipeline(self, request_type: Type[Request]) -> Pipeline:
+        """Return a compiled pipeline, which runs a request through the handler."""
+        traced = tracing.get_tracer().enabled
+        pipelines = self._traced_pipelines if traced else self._pipelines
+        pipeline = pipelines.get(request_type)
+        if pipeline is None:
+            pipeline = pipelines[request_type] = self._compile(request_type, traced)
+        return pipeline
+
+    def _compile(self, request_type: Type[Request], traced: bool) -> Pipeline:
+        middlewares = [
+            middleware for middleware in self._chain if middleware.applies_to(request_type)
+        ]
+        if not middlewares:
+            return _run_handler
+
+        handle: Handle = _handle_by_current_handler
+        for middleware in reversed(middlewares):
+            if traced:
+                handle = _traced(middleware, handle)
+            else:
+                handle = functools.partial(middleware.__call__, handle=handle)
+
+        async def _run(handler: "RequestHandler", request: Req) -> Res:
+            token = _current_handler.set(handler)
+            try:
+                return await handle(request)
+            finally:
+                _current_handler.reset(token)
+
+        return _run
+
+
+def _traced(middleware: "Middleware", handle: Handle) -> Handle:
+    name = f"middleware.{type(middleware).__name__}"
+
+    async def _call(request: Req) -> Res:
+        with tracing.span(name):
+            return await middleware(request, handle=handle)
+
+    return _call
+
+
+def _run_handler(handler: "RequestHandler", request: Req) -> Awaitable[Res]:
+    return handler.handle(request)
+
+
+def _handle_by_current_handler(request: Req) -> Awaitable[Res]:
+    return _current_handler.get().handle(request)
+
 
 class Logger(Protocol):
     def log(
@@ -70,14 +70,23 @@ class RequestHandler(Protocol[Req, Res]):
 class RequestMap:
     def __init__(self) -> None:
         self._request_map: dict[Type[Request], Callable[[], RequestHandler]] = {}
+        self._frozen = False
 
     def bind(
         self,
         request_type: Type[Request],
         handler_type: Callable[[], RequestHandler],
     ) -> None:
+        if self._frozen:
+            raise RuntimeError("RequestMap is frozen, handlers must be bound before freeze.")
         self._request_map[request_type] = handler_type
 
+    def freeze(self) -> None:
+        self._frozen = True
+
+    def get_requests(self) -> list[Type[Request]]:
+        return list(self._request_map.keys())
+
     def get(self, request_type: Type[Request]) -> Callable[[], RequestHandler]:
         handler_type = self._request_map.get(request_type)
         if not handler_type:
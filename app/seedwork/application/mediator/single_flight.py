@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Hashable, Type
+
+from app.seedwork.application.mediator.cache import QueryCache, request_key
+from app.seedwork.application.mediator.middlewares import HandleType, Middleware, Res
+from app.seedwork.application.messages import Request
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightMiddleware(Middleware):
+    """Runs only one of the equal queries in flight, the others wait for its response.
+
+    Requests are equal when they have the same type and fields except request_id.
+    Only registered request types are coalesced, register queries only, commands must
+    always be handled. Every caller gets the same response object (or exception).
+
+    When the query cache is passed, queries sent after the cache of their type was
+    invalidated don't join the queries started before, so a query sent after a command
+    always sees its changes.
+
+    Usage::
+
+      single_flight = SingleFlightMiddleware(query_cache)
+      single_flight.register(GetUsersQuery)
+      middleware_chain.add(single_flight)
+
+    """
+
+    def __init__(self, query_cache: QueryCache | None = None) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self._query_cache = query_cache
+        self._request_types: set[Type[Request]] = set()
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def register(self, request_type: Type[Request]) -> None:
+        self._request_types.add(request_type)
+
+    def applies_to(self, request_type: Type[Request]) -> bool:
+        return request_type in self._request_types
+
+    async def __call__(self, request: Request, handle: HandleType) -> Res:
+        # MiddlewareChain.wrap doesn't check applies_to
+        if type(request) not in self._request_types:
+            return await handle(request)
+        try:
+            key = request_key(request)
+        except TypeError:
+            return await handle(request)
+        if self._query_cache is not None:
+            key = (key, self._query_cache.generation(type(request)))
+
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            # the task copies the context, so it runs with the handler of this request
+            task = asyncio.ensure_future(handle(request))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._done(key, task))
+        else:
+            self.coalesced += 1
+            logger.debug("%s request joined the one in flight", type(request).__name__)
+
+        # a cancelled caller must not cancel the query the others wait for
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight,
+        }
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # mark the exception retrieved when all callers were cancelled
+            task.exception()
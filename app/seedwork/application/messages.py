@@ -23,6 +23,7 @@ SOFTWARE.
 """
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import ClassVar
 from uuid import UUID, uuid4
 
 
@@ -75,7 +76,12 @@ class Event:
 
 @dataclass(frozen=True, kw_only=True)
 class DomainEvent(Event):
-    """The base class for domain events."""
+    """The base class for domain events.
+
+    Set ``deferred`` to handle the event in background after the response is sent.
+    """
+
+    deferred: ClassVar[bool] = False
 
 
 @dataclass(frozen=True, kw_only=True)
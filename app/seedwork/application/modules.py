@@ -3,8 +3,10 @@ import logging
 
 from rodi import Container
 
+from app.seedwork.application.mediator.cache import QueryCache
 from app.seedwork.application.mediator.events.map import EventMap
 from app.seedwork.application.mediator.request import RequestMap
+from app.seedwork.application.mediator.single_flight import SingleFlightMiddleware
 
 logger = logging.getLogger(__name__)
 
@@ -21,3 +23,12 @@ class BusinessModule:
     @abc.abstractmethod
     def register_events(self, event_map: EventMap):
         ...
+
+    def register_query_cache(self, query_cache: QueryCache, container: Container):
+        """Register cached queries, nothing is cached by default.
+
+        Called after ``register_dependencies``, settings can be resolved from the container.
+        """
+
+    def register_single_flight(self, single_flight: SingleFlightMiddleware):
+        """Register queries, equal ones of which are handled once while in flight."""
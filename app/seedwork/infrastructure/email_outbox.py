@@ -0,0 +1,363 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from app.seedwork.infrastructure.email_sender import AbstractEmailSender
+from app.seedwork.infrastructure.sqlite import SqlitePool
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    destination TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    message TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS email_outbox_available_at_idx ON email_outbox (available_at);
+CREATE TABLE IF NOT EXISTS email_dead_letters (
+    id INTEGER PRIMARY KEY,
+    destination TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    message TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    failed_at REAL NOT NULL
+);
+"""
+
+INSERT_EMAIL = (
+    "INSERT INTO email_outbox (destination, subject, message, available_at, created_at) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+# emails are leased by moving them to the future, so emails of a crashed worker come back
+CLAIM_EMAILS = """
+UPDATE email_outbox SET available_at = :lease_until, attempts = attempts + 1
+WHERE id IN (
+    SELECT id FROM email_outbox WHERE available_at <= :now ORDER BY available_at LIMIT :limit
+)
+RETURNING id, destination, subject, message, attempts
+"""
+
+DELETE_EMAIL = "DELETE FROM email_outbox WHERE id = ?"
+
+RESCHEDULE_EMAIL = "UPDATE email_outbox SET available_at = ?, last_error = ? WHERE id = ?"
+
+BURY_EMAIL = """
+INSERT INTO email_dead_letters
+    (id, destination, subject, message, attempts, error, created_at, failed_at)
+SELECT id, destination, subject, message, attempts, :error, created_at, :now
+FROM email_outbox WHERE id = :id
+"""
+
+SELECT_DEAD_LETTERS = (
+    "SELECT id, destination, subject, message, attempts, error, created_at, failed_at "
+    "FROM email_dead_letters ORDER BY failed_at DESC LIMIT ?"
+)
+
+REPLAY_DEAD_LETTERS = """
+INSERT INTO email_outbox (destination, subject, message, available_at, created_at)
+SELECT destination, subject, message, :now, created_at FROM email_dead_letters
+WHERE {where}
+"""
+
+DELETE_DEAD_LETTERS = "DELETE FROM email_dead_letters WHERE {where}"
+
+# ids are passed as a json array, so the statement is the same for any number of ids
+IDS_FILTER = "id IN (SELECT value FROM json_each(:ids))"
+
+SELECT_COUNTS = (
+    "SELECT (SELECT count(*) FROM email_outbox), (SELECT count(*) FROM email_dead_letters)"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class OutboxEmail:
+    id: int
+    destination: str
+    subject: str
+    message: str
+    attempts: int
+
+
+@dataclass(frozen=True, slots=True)
+class DeadLetterEmail:
+    id: int
+    destination: str
+    subject: str
+    message: str
+    attempts: int
+    error: str | None
+    created_at: float
+    failed_at: float
+
+
+class EmailOutbox:
+    """Durable queue of emails stored in sqlite, shared by processes using the same file.
+
+    A claimed email is hidden for ``lease`` seconds, so emails of a crashed worker are
+    sent again later. Delivery is at least once.
+    """
+
+    def __init__(self, pool: SqlitePool, lease: float = 60.0) -> None:
+        self.pool = pool
+        self.lease = lease
+
+    async def put(self, destination: str, subject: str, message: str) -> int:
+        now = time.time()
+
+        def _insert(conn: sqlite3.Connection) -> int:
+            with conn:
+                return conn.execute(
+                    INSERT_EMAIL, (destination, subject, message, now, now)
+                ).lastrowid
+
+        return await self.pool.run(_insert)
+
+    async def claim(self, limit: int = 1) -> list[OutboxEmail]:
+        """Take at most ``limit`` due emails, those waiting longest."""
+        now = time.time()
+        params = {"now": now, "lease_until": now + self.lease, "limit": limit}
+
+        def _claim(conn: sqlite3.Connection) -> list[tuple]:
+            with conn:
+                return conn.execute(CLAIM_EMAILS, params).fetchall()
+
+        rows = await self.pool.run(_claim)
+        return [OutboxEmail(*row) for row in rows]
+
+    async def complete(self, email_id: int) -> None:
+        def _delete(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.execute(DELETE_EMAIL, (email_id,))
+
+        await self.pool.run(_delete)
+
+    async def reschedule(self, email_id: int, delay: float, error: str) -> None:
+        available_at = time.time() + delay
+
+        def _update(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.execute(RESCHEDULE_EMAIL, (available_at, error, email_id))
+
+        await self.pool.run(_update)
+
+    async def bury(self, email_id: int, error: str) -> None:
+        """Move the email to dead letters."""
+        now = time.time()
+
+        def _move(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.execute(BURY_EMAIL, {"id": email_id, "error": error, "now": now})
+                conn.execute(DELETE_EMAIL, (email_id,))
+
+        await self.pool.run(_move)
+
+    async def get_dead_letters(self, limit: int = 100) -> list[DeadLetterEmail]:
+        """Return the latest dead letters."""
+        rows = await self.pool.run(
+            lambda conn: conn.execute(SELECT_DEAD_LETTERS, (limit,)).fetchall()
+        )
+        return [DeadLetterEmail(*row) for row in rows]
+
+    async def replay(self, ids: Sequence[int] | None = None) -> int:
+        """Queue dead letters with passed ids, all if None, again. Return how many."""
+        where = "1" if ids is None else IDS_FILTER
+        params = {"now": time.time(), "ids": json.dumps(list(ids or ()))}
+
+        def _move(conn: sqlite3.Connection) -> int:
+            with conn:
+                count = conn.execute(REPLAY_DEAD_LETTERS.format(where=where), params).rowcount
+                conn.execute(DELETE_DEAD_LETTERS.format(where=where), params)
+            return count
+
+        count = await self.pool.run(_move)
+        logger.info("%d dead letter emails replayed", count)
+        return count
+
+    async def counts(self) -> tuple[int, int]:
+        """Return numbers of queued emails and dead letters."""
+        return await self.pool.run(lambda conn: conn.execute(SELECT_COUNTS).fetchone())
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class OutboxEmailSender(AbstractEmailSender):
+    """Puts emails into the outbox, a pool of workers sends them with ``sender``.
+
+    ``send`` returns once the email is stored, so a slow or failing provider never
+    blocks the caller. One claimer takes due emails from the outbox in batches, as
+    many as there are idle workers, so workers send at most ``workers`` emails at
+    once and the outbox is polled every ``poll_interval`` seconds only while idle.
+    A failed email is retried after ``retry_delay`` seconds doubled on every attempt,
+    up to ``max_retry_delay``, after ``max_attempts`` attempts it goes to dead letters.
+    Emails left in the outbox on stop are sent after the next start.
+
+    Usage::
+
+      sender = OutboxEmailSender(EmailOutbox(pool), EmailSender(client, ...), workers=8)
+      sender.start()
+      await sender.send("user@example.com", "Welcome", "<p>Hi</p>")
+      ...
+      await sender.aclose()
+
+    """
+
+    def __init__(
+        self,
+        outbox: EmailOutbox,
+        sender: AbstractEmailSender,
+        workers: int = 8,
+        max_attempts: int = 8,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 600.0,
+        poll_interval: float = 1.0,
+        drain_timeout: float = 10.0,
+    ) -> None:
+        self.outbox = outbox
+        self.sender = sender
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.poll_interval = poll_interval
+        self.drain_timeout = drain_timeout
+        self.sent = 0
+        self.failed = 0
+        self._wakeup: asyncio.Event | None = None
+        self._worker_idle: asyncio.Event | None = None
+        self._queue: asyncio.Queue[OutboxEmail] | None = None
+        # claimed emails not sent yet, queued or being sent
+        self._in_flight = 0
+        self._stopping = False
+        self._claimer: asyncio.Task | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def send(self, destination: str, subject: str, message: str):
+        await self.outbox.put(destination, subject, message)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._worker_idle = asyncio.Event()
+        self._queue = asyncio.Queue(self.workers)
+        self._in_flight = 0
+        self._claimer = asyncio.create_task(self._claim(), name="email-claimer")
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"email-worker-{idx}")
+            for idx in range(self.workers)
+        ]
+        logger.info("Email outbox started with %d workers", self.workers)
+
+    async def aclose(self) -> None:
+        """Let workers finish emails claimed so far and stop them, queued emails are kept."""
+        if self.running:
+            self._stopping = True
+            self._wakeup.set()
+            self._worker_idle.set()
+            deadline = time.monotonic() + self.drain_timeout
+            # stops after its current claim, meanwhile workers take the claimed emails
+            await asyncio.wait({self._claimer}, timeout=self.drain_timeout)
+            drain = asyncio.create_task(self._queue.join())
+            while not drain.done() and (timeout := deadline - time.monotonic()) > 0:
+                # emails being sent may wait in a batch of the sender until it is closed
+                await self.sender.aclose()
+                await asyncio.wait({drain}, timeout=min(timeout, self.poll_interval))
+            if not drain.done():
+                logger.warning(
+                    "%d emails were not sent in %ss, they are sent again after restart",
+                    self._in_flight,
+                    self.drain_timeout,
+                )
+            for task in (drain, self._claimer, *self._tasks):
+                task.cancel()
+            await asyncio.gather(drain, self._claimer, *self._tasks, return_exceptions=True)
+            self._claimer = None
+            self._tasks = []
+            self._wakeup = self._worker_idle = self._queue = None
+            logger.info("Email outbox stopped")
+        await self.sender.aclose()
+
+    async def _claim(self) -> None:
+        while not self._stopping:
+            idle = self.workers - self._in_flight
+            if not idle:
+                self._worker_idle.clear()
+                await self._worker_idle.wait()
+                continue
+            # cleared before claiming, so an email put meanwhile wakes the claimer again
+            self._wakeup.clear()
+            try:
+                emails = await self.outbox.claim(idle)
+            except sqlite3.Error:
+                logger.exception("Email outbox is not available")
+                emails = []
+            for email in emails:
+                self._in_flight += 1
+                self._queue.put_nowait(email)
+            if len(emails) < idle:
+                # no more emails are due
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _work(self) -> None:
+        while True:
+            email = await self._queue.get()
+            try:
+                await self._deliver(email)
+            except sqlite3.Error:
+                logger.exception("Email outbox is not available")
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+                self._worker_idle.set()
+
+    async def _deliver(self, email: OutboxEmail) -> None:
+        try:
+            await self.sender.send(email.destination, email.subject, email.message)
+        except Exception as exc:
+            self.failed += 1
+            error = repr(exc)
+            if email.attempts >= self.max_attempts:
+                logger.error(
+                    "Email(%d) to %s failed %d times, dead-lettered: %s",
+                    email.id,
+                    email.destination,
+                    email.attempts,
+                    error,
+                )
+                await self.outbox.bury(email.id, error)
+                return
+            delay = min(self.retry_delay * 2 ** (email.attempts - 1), self.max_retry_delay)
+            logger.warning(
+                "Email(%d) failed (attempt %d), retrying in %.1fs: %s",
+                email.id,
+                email.attempts,
+                delay,
+                error,
+            )
+            await self.outbox.reschedule(email.id, delay, error)
+            return
+        self.sent += 1
+        await self.outbox.complete(email.id)
@@ -1,7 +1,8 @@
 import abc
+import asyncio
 import logging
 
-from app.seedwork.infrastructure.mailjet import EmailUser, MailjetClient
+from app.seedwork.infrastructure.mailjet import EmailNotSent, EmailUser, MailjetClient, Message
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +12,12 @@ class AbstractEmailSender(abc.ABC):
     async def send(self, destination: str, subject: str, message: str):
         pass
 
+    def start(self) -> None:
+        """Start background work, must be called from the running event loop."""
+
+    async def aclose(self) -> None:
+        """Finish sending emails accepted so far."""
+
 
 class EmailSender(AbstractEmailSender):
     def __init__(self, client: MailjetClient, from_email: str, from_email_name: str):
@@ -19,9 +26,94 @@ class EmailSender(AbstractEmailSender):
 
     async def send(self, destination: str, subject: str, message: str):
         to_user = EmailUser(email=destination)
-        await self.client.send_email(
+        sent = await self.client.send_email(
             self.from_user, [to_user], subject, html_part=message
         )
+        if not sent:
+            raise EmailNotSent(destination)
+
+
+class BatchingEmailSender(AbstractEmailSender):
+    """Sends emails of concurrent callers together, in one Mailjet request per batch.
+
+    Emails are buffered until ``max_batch_size`` of them are waiting or the first
+    of them has waited ``max_delay`` seconds. Every caller waits for its own email
+    and gets ``EmailNotSent`` when Mailjet rejected it, the rest of the batch is
+    not affected. Transport errors fail the whole batch.
+
+    Usage::
+
+      sender = BatchingEmailSender(client, "noreply@example.com", "Example")
+      await sender.send("user@example.com", "Welcome", "<p>Hi</p>")
+      ...
+      await sender.aclose()
+
+    """
+
+    def __init__(
+        self,
+        client: MailjetClient,
+        from_email: str,
+        from_email_name: str,
+        max_batch_size: int = 50,
+        max_delay: float = 0.05,
+    ) -> None:
+        self.client = client
+        self.from_user = EmailUser(email=from_email, name=from_email_name)
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.batches = 0
+        self._pending: list[tuple[Message, asyncio.Future[bool]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def send(self, destination: str, subject: str, message: str):
+        loop = asyncio.get_running_loop()
+        msg = Message(
+            from_user=self.from_user,
+            to_users=[EmailUser(email=destination)],
+            subject=subject,
+            html_part=message,
+        )
+        future = loop.create_future()
+        self._pending.append((msg, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+
+        if not await future:
+            raise EmailNotSent(destination)
+
+    async def aclose(self) -> None:
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._send_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, batch: list[tuple[Message, asyncio.Future[bool]]]) -> None:
+        self.batches += 1
+        try:
+            results = await self.client.send_messages([msg for msg, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), sent in zip(batch, results):
+            # the caller may be cancelled meanwhile
+            if not future.done():
+                future.set_result(sent)
 
 
 class StubEmailSender(AbstractEmailSender):
@@ -0,0 +1,81 @@
+import asyncio
+import contextlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a sleeping task.
+
+    Every ``interval`` seconds the monitor sleeps and records the delay over the
+    interval. The lag jumps to a new maximum at once and halves on every calmer
+    sample, so a short spike is kept for a few intervals. The loop is overloaded
+    when the lag or the number of requests in flight crosses its threshold.
+
+    Usage::
+
+      monitor = LoopLagMonitor(lag_threshold=0.2)
+      monitor.start()
+      ...
+      if monitor.overloaded:
+          ...
+      await monitor.stop()
+
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        lag_threshold: float = 0.2,
+        max_in_flight: int | None = None,
+    ) -> None:
+        self.interval = interval
+        self.lag_threshold = lag_threshold
+        self.max_in_flight = max_in_flight
+        self.lag = 0.0
+        # maintained by the code handling requests
+        self.in_flight = 0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def overloaded(self) -> bool:
+        if self.lag > self.lag_threshold:
+            return True
+        return self.max_in_flight is not None and self.in_flight > self.max_in_flight
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        was_overloaded = False
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self.lag = max(lag, self.lag / 2)
+
+            if self.overloaded != was_overloaded:
+                was_overloaded = self.overloaded
+                if was_overloaded:
+                    logger.warning(
+                        "Event loop is overloaded, lag %.3fs, %d requests in flight",
+                        self.lag,
+                        self.in_flight,
+                    )
+                else:
+                    logger.info("Event loop is not overloaded anymore")
@@ -1,10 +1,14 @@
+import asyncio
 import logging
+import random
 from http import HTTPStatus
 from typing import Any, Literal
 
 import httpx
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.seedwork.infrastructure import tracing
+
 logger = logging.getLogger(__name__)
 
 HttpMethod = Literal["GET", "OPTIONS", "HEAD", "POST", "PUT", "PATCH", "DELETE"]
@@ -14,7 +18,7 @@ class EmailUser(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
     email: str = Field(alias="Email")
-    name: str | None = Field(alias="Name")
+    name: str | None = Field(default=None, alias="Name")
 
 
 class Attachment(BaseModel):
@@ -23,7 +27,7 @@ class Attachment(BaseModel):
     content_type: str = Field(alias="ContentType")
     filename: str = Field(alias="Filename")
     base64_content: str = Field(alias="Base64Content")
-    content_id: str | None = Field(alias="ContentID")
+    content_id: str | None = Field(default=None, alias="ContentID")
 
 
 class Message(BaseModel):
@@ -32,18 +36,65 @@ class Message(BaseModel):
     from_user: EmailUser = Field(alias="From")
     to_users: list[EmailUser] = Field(alias="To")
     subject: str = Field(alias="Subject")
-    text_part: str | None = Field(alias="TextPart")
-    html_part: str | None = Field(alias="HTMLPart")
-    attachments: list[Attachment] | None = Field(alias="Attachments")
-    inline_attachments: list[Attachment] | None = Field(alias="InlinedAttachments")
+    text_part: str | None = Field(default=None, alias="TextPart")
+    html_part: str | None = Field(default=None, alias="HTMLPart")
+    attachments: list[Attachment] | None = Field(default=None, alias="Attachments")
+    inline_attachments: list[Attachment] | None = Field(
+        default=None, alias="InlinedAttachments"
+    )
 
 
 class MailjetClient:
+    """Mailjet API client.
+
+    Requests go through one pooled ``httpx.AsyncClient`` with keep-alive connections,
+    it is created on the first call and must be closed with ``aclose``. Requests
+    throttled with 429, answered with 503 or not sent because the connection failed
+    are retried with jittered exponential backoff, or after Retry-After when Mailjet
+    sends it, waiting at most ``max_retry_delay`` seconds. Other 5xx responses are
+    not retried, Mailjet may have sent the emails anyway. HTTP/2 requires
+    ``httpx[http2]``.
+    """
+
     base_url = "https://api.mailjet.com/v3.1"
+    # the emails were not accepted, so sending them again doesn't duplicate them
+    retry_statuses = frozenset({429, 503})
 
-    def __init__(self, auth: tuple[str, str], timeout: float = 5.0):
+    def __init__(
+        self,
+        auth: tuple[str, str],
+        timeout: float = 5.0,
+        *,
+        base_url: str | None = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        max_retries: int = 2,
+        retry_backoff: float = 0.2,
+        max_retry_delay: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
         self.auth = auth
         self.timeout = timeout
+        if base_url:
+            self.base_url = base_url
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_retry_delay = max_retry_delay
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def send_email(
         self,
@@ -57,6 +108,7 @@ class MailjetClient:
     ) -> bool:
         """Send email. Return True if was sent, False otherwise.
 
+        :raises EmailNotSent when the client has no credentials
         :raises TimeoutError when request to Mailjet timed out
         :raises MailjetAPIError when transport error occurred
         """
@@ -71,6 +123,8 @@ class MailjetClient:
         )
         payload = {"Messages": [msg.dict(exclude_none=True, by_alias=True)]}
         response = await self._call_api("POST", f"{self.base_url}/send", json=payload)
+        if response is None:
+            raise EmailNotSent(", ".join(user.email for user in to_users))
         if response.status_code != HTTPStatus.OK:
             logger.error(
                 "Failed to send email. Mailjet returned %d status code. Response: %s",
@@ -80,26 +134,115 @@ class MailjetClient:
             return False
         return response.json()
 
+    async def send_messages(self, messages: list[Message]) -> list[bool]:
+        """Send messages in one request. Return whether each of them was sent, in order.
+
+        Mailjet accepts at most 50 messages per request. When some of them are
+        invalid it answers 400 with the status of every message, so the valid
+        ones are still reported as sent.
+
+        :raises EmailNotSent when the client has no credentials
+        :raises TimeoutError when request to Mailjet timed out
+        :raises MailjetAPIError when transport error occurred
+        """
+        payload = {
+            "Messages": [msg.model_dump(exclude_none=True, by_alias=True) for msg in messages]
+        }
+        response = await self._call_api("POST", f"{self.base_url}/send", json=payload)
+        if response is None:
+            raise EmailNotSent(
+                ", ".join(user.email for msg in messages for user in msg.to_users)
+            )
+
+        try:
+            results = response.json()["Messages"]
+        except (ValueError, KeyError, TypeError):
+            results = None
+        if not isinstance(results, list) or len(results) != len(messages):
+            logger.error(
+                "Failed to send %d emails. Mailjet returned %d status code. Response: %s",
+                len(messages),
+                response.status_code,
+                response.text,
+            )
+            return [False] * len(messages)
+
+        sent = [result.get("Status") == "success" for result in results]
+        if not all(sent):
+            logger.error(
+                "Mailjet rejected %d of %d emails. Errors: %s",
+                sent.count(False),
+                len(messages),
+                [result.get("Errors") for result in results if result.get("Status") != "success"],
+            )
+        return sent
+
     async def _call_api(
         self, method: HttpMethod, url: str, json: dict[str, Any] | None = None
     ) -> httpx.Response | None:
         if not all(self.auth):
             return None
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.request(
-                    method,
-                    url,
-                    json=json,
-                    auth=self.auth,
-                    timeout=self.timeout,
+        with tracing.span("mailjet.call_api", method=method, url=url) as span:
+            client = self._get_client()
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = await client.request(method, url, json=json)
+                except (httpx.ConnectError, httpx.ConnectTimeout) as exc:
+                    # the request was not sent, so it is safe to send it again
+                    if attempt == self.max_retries:
+                        if isinstance(exc, httpx.TimeoutException):
+                            raise TimeoutError from None
+                        raise MailjetAPIError(exc) from None
+                    delay = self._backoff(attempt)
+                    logger.warning("Mailjet is not reachable, retrying in %.2fs: %r", delay, exc)
+                    await asyncio.sleep(delay)
+                    continue
+                except httpx.TimeoutException:
+                    raise TimeoutError from None
+                except httpx.RequestError as exc:
+                    raise MailjetAPIError(exc) from None
+
+                if span is not None:
+                    span.attributes["status_code"] = response.status_code
+                    span.attributes["attempts"] = attempt + 1
+                if response.status_code not in self.retry_statuses or attempt == self.max_retries:
+                    return response
+
+                delay = self._retry_delay(response, attempt)
+                logger.warning(
+                    "Mailjet returned %d status code, retrying in %.2fs",
+                    response.status_code,
+                    delay,
                 )
-                return response
-            except httpx.TimeoutException:
-                raise TimeoutError from None
-            except httpx.RequestError as exc:
-                raise MailjetAPIError(exc) from None
+                await asyncio.sleep(delay)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                auth=self.auth,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self._transport,
+            )
+        return self._client
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            return min(float(retry_after), self.max_retry_delay)
+        return self._backoff(attempt)
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter, so clients throttled together don't retry together
+        return random.uniform(0, min(self.retry_backoff * 2**attempt, self.max_retry_delay))
 
 
 class MailjetAPIError(Exception):
     ...
+
+
+class EmailNotSent(Exception):
+    def __init__(self, destination: str) -> None:
+        super().__init__(f"Email to {destination} was not sent")
+        self.destination = destination
@@ -0,0 +1,82 @@
+import asyncio
+import random
+import uuid
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.types import Receive, Scope, Send
+
+
+class FakeMailjet:
+    """Local ASGI stand-in of the Mailjet send API for benchmarks and development.
+
+    Every message is answered as sent after ``latency`` seconds, ``throttle_rate`` and
+    ``error_rate`` of requests are answered with 429 and 503 instead. Messages to
+    addresses in ``.invalid`` domains are rejected, like Mailjet does with 400
+    and the status of every message of the request.
+
+    Usage::
+
+      fake = FakeMailjet(latency=0.05)
+      client = MailjetClient(("key", "secret"), transport=httpx.ASGITransport(app=fake))
+
+    """
+
+    def __init__(
+        self, latency: float = 0.0, error_rate: float = 0.0, throttle_rate: float = 0.0
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.requests = 0
+        self.sent = 0
+        self._app = Starlette(routes=[Route("/v3.1/send", self._send, methods=["POST"])])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self._app(scope, receive, send)
+
+    async def _send(self, request: Request) -> JSONResponse:
+        self.requests += 1
+        payload = await request.json()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        chance = random.random()
+        if chance < self.throttle_rate:
+            return JSONResponse({"ErrorMessage": "Too many requests"}, status_code=429)
+        if chance < self.throttle_rate + self.error_rate:
+            return JSONResponse({"ErrorMessage": "Service unavailable"}, status_code=503)
+
+        messages = []
+        for message in payload["Messages"]:
+            invalid = [
+                user["Email"] for user in message["To"] if user["Email"].endswith(".invalid")
+            ]
+            if invalid:
+                messages.append({
+                    "Status": "error",
+                    "Errors": [
+                        {
+                            "ErrorCode": "mj-0013",
+                            "ErrorMessage": f'"{email}" is an invalid email address.',
+                        }
+                        for email in invalid
+                    ],
+                })
+                continue
+            self.sent += 1
+            messages.append({
+                "Status": "success",
+                "To": [
+                    {
+                        "Email": user["Email"],
+                        "MessageUUID": str(uuid.uuid4()),
+                        "MessageID": random.getrandbits(62),
+                    }
+                    for user in message["To"]
+                ],
+            })
+        failed = any(message["Status"] != "success" for message in messages)
+        return JSONResponse({"Messages": messages}, status_code=400 if failed else 200)
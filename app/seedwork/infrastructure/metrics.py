@@ -0,0 +1,184 @@
+import math
+from bisect import bisect_left
+from collections.abc import Callable, Sequence
+
+# seconds, from 1ms to 10s
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        return [
+            (self.name, tuple(zip(self.labelnames, labelvalues)), value)
+            for labelvalues, value in self._values.items()
+        ]
+
+
+class CallbackMetric:
+    """Metric without labels read from ``callback`` on export.
+
+    For values other components count anyway, so recording costs nothing.
+    """
+
+    labelnames = ()
+
+    def __init__(
+        self, name: str, documentation: str, callback: Callable[[], float], type: str
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.type = type
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        return [(self.name, (), self.callback())]
+
+
+class HistogramChild:
+    __slots__ = ("upper_bounds", "counts", "sum")
+
+    def __init__(self, upper_bounds: tuple[float, ...]) -> None:
+        self.upper_bounds = upper_bounds
+        # the last one is the +Inf bucket
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram:
+    """Histogram with labels and fixed buckets.
+
+    Buckets of every label set are preallocated on the first observation, recording
+    is a bisect and two additions. Counts are kept per bucket and summed up on export.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+        self._children: dict[tuple[str, ...], HistogramChild] = {}
+
+    def labels(self, *labelvalues: str) -> HistogramChild:
+        child = self._children.get(labelvalues)
+        if child is None:
+            child = self._children[labelvalues] = HistogramChild(self.upper_bounds)
+        return child
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        self.labels(*labelvalues).observe(value)
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        samples = []
+        for labelvalues, child in self._children.items():
+            labels = tuple(zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for upper_bound, count in zip(self.upper_bounds + (math.inf,), child.counts):
+                cumulative += count
+                le = "+Inf" if upper_bound == math.inf else repr(upper_bound)
+                samples.append((self.name + "_bucket", labels + (("le", le),), cumulative))
+            samples.append((self.name + "_sum", labels, child.sum))
+            samples.append((self.name + "_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Process metrics exported in the Prometheus text format.
+
+    Metrics are recorded from the event loop thread, so they are plain counters
+    without locks, cheap enough to be always on.
+
+    Usage::
+
+      metrics = MetricsRegistry()
+      latency = metrics.histogram("job_duration_seconds", "Job duration.", ["job"])
+      latency.observe(0.2, "cleanup")
+
+      print(metrics.export())
+
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram | CallbackMetric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], float],
+        type: str = "gauge",
+    ) -> CallbackMetric:
+        """Export the value returned by callback, a "gauge" or a "counter"."""
+        return self._register(CallbackMetric(name, documentation, callback, type))
+
+    def export(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    label_pairs = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels)
+                    name = f"{name}{{{label_pairs}}}"
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            # components created more than once share the metric
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} is already registered with other labels")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
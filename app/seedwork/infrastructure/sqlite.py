@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": "5000",
+    "foreign_keys": "ON",
+}
+
+
+class SqlitePool:
+    """Small pool of sqlite connections used from the event loop.
+
+    Every call takes a connection and runs in a dedicated thread pool, so blocking
+    sqlite calls never run on the event loop. Connections are opened lazily in WAL
+    mode, which lets readers work concurrently with a writer, also across processes.
+
+    Usage::
+
+      pool = SqlitePool("db.sqlite3", size=4, init_script="CREATE TABLE ...")
+      rows = await pool.run(lambda conn: conn.execute("SELECT 1").fetchall())
+
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        size: int = 4,
+        init_script: str | None = None,
+        pragmas: dict[str, str] | None = None,
+        cached_statements: int = 128,
+    ) -> None:
+        self.path = path
+        self.size = size
+        self._init_script = init_script
+        self._pragmas = DEFAULT_PRAGMAS | (pragmas or {})
+        self._cached_statements = cached_statements
+        self._connections: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="sqlite")
+
+    async def run(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        """Run passed function with a pooled connection in the pool thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run, func)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+        self._opened = 0
+
+    def _run(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        connection = self._acquire()
+        try:
+            return func(connection)
+        finally:
+            if connection.in_transaction:
+                connection.rollback()
+            self._connections.put(connection)
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._connections.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                return self._connect()
+        return self._connections.get()
+
+    def _connect(self) -> sqlite3.Connection:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            cached_statements=self._cached_statements,
+        )
+        for name, value in self._pragmas.items():
+            connection.execute(f"PRAGMA {name}={value}")
+        if self._init_script:
+            connection.executescript(self._init_script)
+        logger.debug("Sqlite connection to %s opened", self.path)
+        return connection
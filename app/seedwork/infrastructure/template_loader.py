@@ -1,8 +1,19 @@
 import abc
+import logging
 from pathlib import Path
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    select_autoescape,
+)
+
+from app.seedwork.infrastructure import tracing
+
+logger = logging.getLogger(__name__)
 
 
 class AbstractTemplateRenderer(abc.ABC):
@@ -10,22 +21,58 @@ class AbstractTemplateRenderer(abc.ABC):
     async def render(self, template_name: str, **kwargs) -> str:
         """Render template with passed name with passed parameters."""
 
+    def precompile(self) -> None:
+        """Prepare templates before the first render."""
+
 
 class FileSystemTemplateRenderer(AbstractTemplateRenderer):
+    """Renders jinja2 templates of a directory, meant to be shared.
+
+    ``default_render_kwargs`` become globals of the environment, so they are not
+    merged with the parameters on every render. Compiled templates are kept by
+    the renderer after ``precompile`` and, with ``bytecode_cache_dir``, stored on
+    disk, so a new process loads them without parsing. With ``auto_reload``
+    changed template files are picked up, at the cost of a stat per render.
+    """
+
     def __init__(
-        self, source_dir: str | Path, default_render_kwargs: dict[str, Any] = None
+        self,
+        source_dir: str | Path,
+        default_render_kwargs: dict[str, Any] = None,
+        *,
+        bytecode_cache_dir: str | Path | None = None,
+        auto_reload: bool = False,
     ):
+        bytecode_cache = None
+        if bytecode_cache_dir is not None:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
         self.env = Environment(
             loader=FileSystemLoader(source_dir),
             autoescape=select_autoescape(),
             enable_async=True,
+            bytecode_cache=bytecode_cache,
+            auto_reload=auto_reload,
         )
         self.default_render_kwargs = default_render_kwargs or {}
+        self.env.globals.update(self.default_render_kwargs)
+        self._templates: dict[str, Template] = {}
+
+    def precompile(self) -> None:
+        """Compile all templates of the source directory."""
+        for template_name in self.env.list_templates():
+            self._templates[template_name] = self.env.get_template(template_name)
+        logger.info("%d templates precompiled", len(self._templates))
 
     async def render(self, template_name: str, **kwargs) -> str:
         """Render template with passed name with passed parameters."""
-        template = self.env.get_template(template_name)
-        rendered_template = await template.render_async(
-            **(self.default_render_kwargs | kwargs)
-        )
+        with tracing.span("template.render", template=template_name):
+            template = self._get_template(template_name)
+            rendered_template = await template.render_async(**kwargs)
         return rendered_template
+
+    def _get_template(self, template_name: str) -> Template:
+        template = self._templates.get(template_name)
+        if template is None or (self.env.auto_reload and not template.is_up_to_date):
+            template = self._templates[template_name] = self.env.get_template(template_name)
+        return template
@@ -0,0 +1,162 @@
+"""Tracing hooks.
+
+Code wraps interesting calls into ``span(name, **attributes)``. By default the tracer
+is a no-op, so spans cost a function call. Install a ``Tracer`` with an exporter to
+record them::
+
+  exporter = InMemorySpanExporter()
+  set_tracer(Tracer(exporter))
+
+  with span("users.import", source="csv"):
+      ...
+
+  assert exporter.spans[0].name == "users.import"
+
+The current span is kept in a context variable, so it propagates into awaited calls
+and tasks. ``inject`` and ``extract`` pass it to other processes in the W3C
+traceparent format.
+"""
+import abc
+import logging
+import random
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT = "traceparent"
+
+
+@dataclass(slots=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    context: SpanContext
+    parent_id: str | None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start: float = 0.0
+    end: float | None = None
+    error: BaseException | None = None
+
+    @property
+    def duration(self) -> float | None:
+        return None if self.end is None else self.end - self.start
+
+
+_current_span: ContextVar[SpanContext | None] = ContextVar("current_span", default=None)
+
+
+class SpanExporter(abc.ABC):
+    @abc.abstractmethod
+    def export(self, span: Span) -> None:
+        """Called from the event loop when the span is finished, must not block."""
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps finished spans in a list, used in tests."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class NoopTracer:
+    enabled = False
+
+    _null_context = nullcontext()
+
+    def span(
+        self, name: str, parent: SpanContext | None = None, **attributes: Any
+    ) -> AbstractContextManager[Span | None]:
+        return self._null_context
+
+
+class Tracer(NoopTracer):
+    enabled = True
+
+    def __init__(self, exporter: SpanExporter) -> None:
+        self.exporter = exporter
+
+    @contextmanager
+    def span(
+        self, name: str, parent: SpanContext | None = None, **attributes: Any
+    ) -> Iterator[Span]:
+        parent = parent or _current_span.get()
+        context = SpanContext(
+            trace_id=parent.trace_id if parent else f"{random.getrandbits(128):032x}",
+            span_id=f"{random.getrandbits(64):016x}",
+        )
+        span = Span(
+            name=name,
+            context=context,
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes,
+            start=time.time(),
+        )
+        token = _current_span.set(context)
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = exc
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end = time.time()
+            try:
+                self.exporter.export(span)
+            except Exception:
+                logger.exception("Failed to export span %s", name)
+
+
+_tracer: NoopTracer = NoopTracer()
+
+
+def set_tracer(tracer: NoopTracer) -> None:
+    """Install the tracer, requests sent after that are traced."""
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> NoopTracer:
+    return _tracer
+
+
+def span(
+    name: str, parent: SpanContext | None = None, **attributes: Any
+) -> AbstractContextManager[Span | None]:
+    """Start a span, a child of the current one or of the passed parent."""
+    return _tracer.span(name, parent, **attributes)
+
+
+def current_span() -> SpanContext | None:
+    return _current_span.get()
+
+
+def inject(carrier: dict[str, str]) -> dict[str, str]:
+    """Put the current span into the carrier, so a consumer can continue the trace."""
+    context = _current_span.get()
+    if context is not None:
+        carrier[TRACEPARENT] = f"00-{context.trace_id}-{context.span_id}-01"
+    return carrier
+
+
+def extract(carrier: dict[str, str]) -> SpanContext | None:
+    """Read the span put by inject, pass it as the parent of the consumer span."""
+    try:
+        _, trace_id, span_id, _ = carrier[TRACEPARENT].split("-")
+    except (KeyError, ValueError):
+        return None
+    return SpanContext(trace_id=trace_id, span_id=span_id)
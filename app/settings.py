@@ -2,7 +2,7 @@ from importlib.metadata import version
 from pathlib import Path
 from typing import Literal, Any
 
-from pydantic import field_validator, RedisDsn
+from pydantic import BaseModel, field_validator, RedisDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 VERSION = version("service-example")  # name of the package specified pyproject.toml
@@ -21,6 +21,8 @@ class BaseAppSettings(BaseSettings):
 class AppSettings(BaseAppSettings):
     base_path: Path = base_path
     project_path: Path = base_path / "app"
+    # compiled templates shared by processes, None disables the cache
+    templates_cache_path: Path | None = base_path / "data" / "templates-cache"
     sentry_dsn: str = ""
 
 
@@ -37,6 +39,14 @@ class WebSettings(BaseAppSettings):
         r"^(https?:\/\/(?:.+\.)?(localhost|127\.0\.0\.1)(?::\d{1,5})?)$"
     )
     url_prefix: str = "/api"
+    # HTTP timings and Prometheus /metrics endpoint
+    metrics_enabled: bool = True
+    # /readyz fails and low priority paths are answered with 503 when the event loop
+    # lags or too many requests are in flight
+    loop_lag_interval: float = 0.1
+    loop_lag_threshold: float = 0.2
+    max_in_flight_requests: int | None = None
+    low_priority_paths: list[str] = ["/api/v1/users/export"]
 
     @property
     def fastapi_kwargs(self) -> dict[str, Any]:
@@ -56,6 +66,63 @@ class WebSettings(BaseAppSettings):
         return fastapi_kwargs
 
 
+class AdmissionLimit(BaseModel):
+    max_concurrency: int | None = None
+    rate: float | None = None
+    burst: int | None = None
+    queue_timeout: float = 0.0
+
+
+class AdmissionSettings(BaseAppSettings):
+    """Limits of requests handled by the mediator, nothing is limited by default.
+
+    Exceeded rate is answered with 429, exceeded concurrency with 503. With
+    queue_timeout requests wait that many seconds for a slot instead of failing fast.
+    """
+
+    # limits of request types without own limits
+    admission_max_concurrency: int | None = None
+    admission_rate: float | None = None
+    admission_burst: int | None = None
+    admission_queue_timeout: float = 0.0
+    # by request type name, e.g. {"GetUsersQuery": {"max_concurrency": 50}}
+    admission_limits: dict[str, AdmissionLimit] = {}
+
+    @property
+    def default_limit(self) -> AdmissionLimit | None:
+        if self.admission_max_concurrency is None and self.admission_rate is None:
+            return None
+        return AdmissionLimit(
+            max_concurrency=self.admission_max_concurrency,
+            rate=self.admission_rate,
+            burst=self.admission_burst,
+            queue_timeout=self.admission_queue_timeout,
+        )
+
+
+class MediatorSettings(BaseAppSettings):
+    # run handlers of a domain event and events of a request concurrently
+    events_concurrent: bool = False
+    # events of a request emitted at once in the concurrent mode, e.g. of a users batch
+    events_max_concurrency: int = 10
+    event_handler_timeout: float | None = None
+    # handle equal queries in flight once
+    single_flight: bool = True
+    # deferred event handlers
+    background_event_workers: int = 4
+    background_event_queue_size: int = 1000
+    background_event_max_retries: int = 3
+    background_event_retry_delay: float = 0.5
+    background_event_drain_timeout: float = 10.0
+    # latest dead-lettered jobs kept in memory
+    background_event_max_dead_letters: int = 1000
+
+
+class QueryCacheSettings(BaseAppSettings):
+    query_cache_max_size: int = 1024
+    query_cache_ttl: float = 60.0
+
+
 class LoggingSettings(BaseAppSettings):
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
 
@@ -110,6 +177,28 @@ class MailSettings(BaseAppSettings):
     mailjet_secret_key: str = ""
     default_from_email: str = "noreply@example.com"
     default_from_email_name: str = "example.com"
+    mailjet_base_url: str | None = None
+    mailjet_timeout: float = 5.0
+    mailjet_max_connections: int = 20
+    mailjet_max_keepalive_connections: int = 10
+    mailjet_keepalive_expiry: float = 30.0
+    # requires httpx[http2]
+    mailjet_http2: bool = False
+    mailjet_max_retries: int = 2
+    mailjet_retry_backoff: float = 0.2
+    # longest wait before a retry, also when Mailjet asks for a longer Retry-After
+    mailjet_max_retry_delay: float = 10.0
+    # emails sent in one request, 1 disables batching, Mailjet accepts up to 50
+    mailjet_batch_size: int = 50
+    mailjet_batch_delay: float = 0.05
+    # emails are stored in sqlite and sent by workers started with the web app
+    email_outbox_enabled: bool = True
+    email_outbox_path: Path = base_path / "data" / "email-outbox.sqlite3"
+    # emails sent at once, at least mailjet_batch_size to fill batches
+    email_outbox_workers: int = 50
+    email_outbox_max_attempts: int = 8
+    email_outbox_retry_delay: float = 1.0
+    email_outbox_max_retry_delay: float = 600.0
 
     root_domain: str = "example.com"
     app_url: str = f"https://app.{root_domain}"
@@ -120,5 +209,19 @@ class MailSettings(BaseAppSettings):
     email_unsubscribe_url: str = f"{app_url}/unsubscribe"
 
 
+class UsersSettings(BaseAppSettings):
+    # "sqlite" is shared between processes, "memory" is local to a process
+    users_repository: Literal["memory", "sqlite"] = "memory"
+    # "compact" keeps users in flat buffers, it is slower to read but takes less memory
+    users_storage: Literal["default", "compact"] = "default"
+    # set to keep in-memory users between restarts
+    users_journal_dir: Path | None = None
+    users_snapshot_every: int = 100_000
+    users_journal_fsync: bool = False
+
+    users_sqlite_path: Path = base_path / "data" / "users.sqlite3"
+    users_sqlite_pool_size: int = 4
+
+
 class RedisSettings(BaseAppSettings):
     redis_url: RedisDsn = "redis://localhost:6379"
@@ -4,12 +4,19 @@ import typer
 import uvicorn
 
 from app.presentation.bootstrap import bootstrap
-from app.presentation.cli import shell
+from app.presentation.cli import mailjet, mediator, outbox, shell, templates, users
 from app.settings import LoggingSettings, VERSION
 
 app = typer.Typer()
 
 app.command("shell", help="Run python shell.")(shell.command)
+app.command("bench-mailjet")(mailjet.bench_command)
+app.command("bench-mediator")(mediator.bench_command)
+app.command("bench-templates")(templates.bench_command)
+app.command("bench-users-insert")(users.bench_insert_command)
+app.command("bench-users-storage")(users.bench_storage_command)
+app.command("dead-letters")(outbox.dead_letters_command)
+app.command("replay-dead-letters")(outbox.replay_command)
 
 
 @app.command("runserver")
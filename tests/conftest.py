@@ -0,0 +1,12 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def app_env(monkeypatch, tmp_path):
+    """Keep the tests away from the files of a local run."""
+    monkeypatch.setenv("APP_USERS_REPOSITORY", "memory")
+    monkeypatch.setenv("APP_USERS_SQLITE_PATH", str(tmp_path / "users.sqlite3"))
+    monkeypatch.delenv("APP_USERS_JOURNAL_DIR", raising=False)
+    monkeypatch.delenv("APP_MAILJET_API_KEY", raising=False)
+    monkeypatch.setenv("APP_EMAIL_OUTBOX_PATH", str(tmp_path / "email-outbox.sqlite3"))
+    monkeypatch.setenv("APP_TEMPLATES_CACHE_PATH", str(tmp_path / "templates-cache"))
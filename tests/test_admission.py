@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from app.modules.users.domain.queries import GetUsersQuery
+from app.seedwork.application.mediator.admission import (
+    AdmissionMiddleware,
+    AdmissionPolicy,
+    Overloaded,
+    RateLimitExceeded,
+)
+
+
+@pytest.mark.asyncio
+async def test_requests_rejected_for_concurrency_dont_use_up_the_rate():
+    middleware = AdmissionMiddleware(
+        {GetUsersQuery: AdmissionPolicy(max_concurrency=1, rate=0.001, burst=2)}
+    )
+    release = asyncio.Event()
+
+    async def _hold(request):
+        await release.wait()
+
+    async def _handle(request):
+        return "ok"
+
+    holder = asyncio.create_task(middleware(GetUsersQuery(), _hold))
+    await asyncio.sleep(0)
+    for _ in range(3):
+        with pytest.raises(Overloaded):
+            await middleware(GetUsersQuery(), _handle)
+    release.set()
+    await holder
+
+    # the second token of the burst is still there
+    assert await middleware(GetUsersQuery(), _handle) == "ok"
+    with pytest.raises(RateLimitExceeded):
+        await middleware(GetUsersQuery(), _handle)
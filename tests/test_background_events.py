@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from app.modules.users.domain.events import UserCreatedEvent
+from app.modules.users.service_layer.event_handlers import UserCreatedEventHandler
+from app.seedwork.application.mediator.events.background import BackgroundEventDispatcher
+from app.seedwork.infrastructure.metrics import MetricsRegistry
+
+
+def _event(user_id: int) -> UserCreatedEvent:
+    return UserCreatedEvent(id=user_id, email=f"user{user_id}@example.com", name="User")
+
+
+@pytest.mark.asyncio
+async def test_running_and_queued_jobs_are_dead_lettered_after_drain_timeout():
+    dispatcher = BackgroundEventDispatcher(workers=1, drain_timeout=0.05)
+    started = asyncio.Event()
+
+    async def _hang(event, handler_type):
+        started.set()
+        await asyncio.sleep(10)
+
+    dispatcher.start()
+    await dispatcher.submit(_event(1), UserCreatedEventHandler, _hang)
+    await dispatcher.submit(_event(2), UserCreatedEventHandler, _hang)
+    await started.wait()
+    await dispatcher.stop()
+
+    assert sorted(letter.event.id for letter in dispatcher.dead_letters) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_job_cancelled_while_waiting_to_retry_keeps_its_error():
+    dispatcher = BackgroundEventDispatcher(workers=1, retry_delay=10, drain_timeout=0.05)
+    failed = asyncio.Event()
+
+    async def _fail(event, handler_type):
+        failed.set()
+        raise RuntimeError("provider is down")
+
+    dispatcher.start()
+    await dispatcher.submit(_event(1), UserCreatedEventHandler, _fail)
+    await failed.wait()
+    await dispatcher.stop()
+
+    [letter] = dispatcher.dead_letters
+    assert isinstance(letter.error, RuntimeError)
+    assert letter.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_latest_dead_letters_are_kept_and_all_are_counted():
+    metrics = MetricsRegistry()
+    dispatcher = BackgroundEventDispatcher(
+        workers=1, max_retries=0, max_dead_letters=2, metrics=metrics
+    )
+
+    async def _fail(event, handler_type):
+        raise RuntimeError("provider is down")
+
+    dispatcher.start()
+    for user_id in range(1, 4):
+        await dispatcher.submit(_event(user_id), UserCreatedEventHandler, _fail)
+    await dispatcher.stop()
+
+    assert [letter.event.id for letter in dispatcher.dead_letters] == [2, 3]
+    assert dispatcher.dead_lettered == 3
+    assert (
+        'event_dead_letters_total{event="UserCreatedEvent",handler="UserCreatedEventHandler"} 3'
+        in metrics.export()
+    )
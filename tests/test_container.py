@@ -0,0 +1,47 @@
+import pytest
+import rodi
+
+from app.modules.users.domain.commands import CreateUserRequest
+from app.presentation.bootstrap import bootstrap
+from app.seedwork.application.mediator.container import RodiContainer
+from app.presentation.container import setup_container
+from app.seedwork.infrastructure.email_sender import AbstractEmailSender, StubEmailSender
+
+
+class Service:
+    ...
+
+
+def test_frozen_container_shares_singletons_with_external_container():
+    container = rodi.Container()
+    container.add_singleton_by_factory(lambda: Service(), Service)
+    rodi_container = RodiContainer(container)
+
+    rodi_container.freeze()
+
+    assert rodi_container.get_activator(Service)() is container.resolve(Service)
+
+
+@pytest.mark.asyncio
+async def test_mediator_handlers_use_singletons_of_container():
+    container, mediator = bootstrap()
+    email_sender = container.resolve(AbstractEmailSender)
+    sent = []
+
+    async def _send(destination: str, subject: str, message: str):
+        sent.append(destination)
+
+    email_sender.send = _send
+
+    await mediator.send(CreateUserRequest(email="user@example.com", name="User"))
+
+    assert sent == ["user@example.com"]
+
+
+def test_email_sender_without_mailjet_secret_is_stub(monkeypatch):
+    monkeypatch.setenv("APP_MAILJET_API_KEY", "key")
+    monkeypatch.setenv("APP_MAILJET_SECRET_KEY", "")
+    monkeypatch.setenv("APP_EMAIL_OUTBOX_ENABLED", "false")
+    container = setup_container()
+
+    assert isinstance(container.resolve(AbstractEmailSender), StubEmailSender)
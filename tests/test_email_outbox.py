@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from app.seedwork.infrastructure.email_outbox import SCHEMA, EmailOutbox, OutboxEmailSender
+from app.seedwork.infrastructure.email_sender import AbstractEmailSender
+from app.seedwork.infrastructure.mailjet import EmailNotSent
+from app.seedwork.infrastructure.sqlite import SqlitePool
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = EmailOutbox(SqlitePool(tmp_path / "outbox.sqlite3", init_script=SCHEMA))
+    yield outbox
+    outbox.close()
+
+
+class FlakySender(AbstractEmailSender):
+    """Fails emails to a destination as many times as set in ``failures``, -1 always."""
+
+    def __init__(self, failures: dict[str, int]) -> None:
+        self.failures = failures
+        self.sent: list[str] = []
+
+    async def send(self, destination: str, subject: str, message: str):
+        if self.failures.get(destination, 0):
+            self.failures[destination] -= 1
+            raise EmailNotSent(destination)
+        self.sent.append(destination)
+
+
+@pytest.mark.asyncio
+async def test_claimed_emails_are_leased(outbox):
+    for idx in range(3):
+        await outbox.put(f"user{idx}@example.com", "Hi", "<p>Hi</p>")
+
+    claimed = await outbox.claim(2)
+
+    assert sorted(email.destination for email in claimed) == [
+        "user0@example.com",
+        "user1@example.com",
+    ]
+    assert [email.attempts for email in claimed] == [1, 1]
+    assert [email.destination for email in await outbox.claim(10)] == ["user2@example.com"]
+    assert await outbox.claim(10) == []
+    assert await outbox.counts() == (3, 0)
+
+
+@pytest.mark.asyncio
+async def test_completed_email_is_removed(outbox):
+    await outbox.put("user@example.com", "Hi", "<p>Hi</p>")
+    (email,) = await outbox.claim()
+
+    await outbox.complete(email.id)
+
+    assert await outbox.counts() == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_rescheduled_email_is_claimed_when_due(outbox):
+    outbox.lease = 0
+    await outbox.put("user@example.com", "Hi", "<p>Hi</p>")
+    (email,) = await outbox.claim()
+
+    await outbox.reschedule(email.id, 60, "EmailNotSent()")
+    assert await outbox.claim() == []
+
+    await outbox.reschedule(email.id, 0, "EmailNotSent()")
+    (email,) = await outbox.claim()
+    assert email.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_buried_email_moves_to_dead_letters(outbox):
+    await outbox.put("user@example.com", "Hi", "<p>Hi</p>")
+    (email,) = await outbox.claim()
+
+    await outbox.bury(email.id, "EmailNotSent()")
+
+    assert await outbox.counts() == (0, 1)
+    (letter,) = await outbox.get_dead_letters()
+    assert (letter.id, letter.destination, letter.attempts, letter.error) == (
+        email.id,
+        "user@example.com",
+        1,
+        "EmailNotSent()",
+    )
+
+
+@pytest.mark.asyncio
+async def test_replay_queues_dead_letters_again(outbox):
+    for idx in range(3):
+        await outbox.put(f"user{idx}@example.com", "Hi", "<p>Hi</p>")
+    for email in await outbox.claim(3):
+        await outbox.bury(email.id, "EmailNotSent()")
+    first, *_ = await outbox.get_dead_letters()
+
+    assert await outbox.replay([first.id]) == 1
+    assert await outbox.counts() == (1, 2)
+    assert await outbox.replay() == 2
+    assert await outbox.counts() == (3, 0)
+    emails = await outbox.claim(3)
+    assert {email.attempts for email in emails} == {1}
+
+
+@pytest.mark.asyncio
+async def test_sender_retries_and_dead_letters_failed_emails(outbox):
+    email_sender = FlakySender({"flaky@example.com": 1, "bad@example.com": -1})
+    sender = OutboxEmailSender(
+        outbox, email_sender, workers=2, max_attempts=3, retry_delay=0, poll_interval=0.01
+    )
+    sender.start()
+    for destination in ("ok@example.com", "flaky@example.com", "bad@example.com"):
+        await sender.send(destination, "Hi", "<p>Hi</p>")
+
+    async def _settled():
+        while await outbox.counts() != (0, 1):
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(_settled(), 5)
+    await sender.aclose()
+
+    assert sorted(email_sender.sent) == ["flaky@example.com", "ok@example.com"]
+    assert (sender.sent, sender.failed) == (2, 4)
+    (letter,) = await outbox.get_dead_letters()
+    assert (letter.destination, letter.attempts) == ("bad@example.com", 3)
@@ -0,0 +1,74 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.seedwork.infrastructure.email_outbox import SCHEMA, EmailOutbox, OutboxEmailSender
+from app.seedwork.infrastructure.email_sender import BatchingEmailSender
+from app.seedwork.infrastructure.mailjet import MailjetClient
+from app.seedwork.infrastructure.mailjet_fake import FakeMailjet
+from app.seedwork.infrastructure.sqlite import SqlitePool
+
+
+@pytest.fixture
+def mailjet():
+    return FakeMailjet()
+
+
+@pytest.fixture
+def batching_sender(mailjet):
+    client = MailjetClient(
+        ("key", "secret"),
+        base_url="http://mj/v3.1",
+        transport=httpx.ASGITransport(app=mailjet),
+    )
+    # batches are not full and never time out, only aclose sends them
+    return BatchingEmailSender(
+        client, "noreply@example.com", "Example", max_batch_size=50, max_delay=3600
+    )
+
+
+@pytest.mark.asyncio
+async def test_batching_sender_sends_queued_emails_on_close(mailjet, batching_sender):
+    sends = [
+        asyncio.create_task(batching_sender.send(f"user{idx}@example.com", "Hi", "<p>Hi</p>"))
+        for idx in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    await batching_sender.aclose()
+
+    await asyncio.gather(*sends)
+    assert mailjet.sent == 3
+    assert batching_sender.batches == 1
+    await batching_sender.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_outbox_sender_sends_queued_emails_on_close(mailjet, batching_sender, tmp_path):
+    outbox = EmailOutbox(SqlitePool(tmp_path / "outbox.sqlite3", init_script=SCHEMA))
+    sender = OutboxEmailSender(outbox, batching_sender, workers=8)
+    batched = []
+    send = batching_sender.send
+
+    async def _send(destination: str, subject: str, message: str):
+        batched.append(destination)
+        await send(destination, subject, message)
+
+    batching_sender.send = _send
+    sender.start()
+    for idx in range(3):
+        await sender.send(f"user{idx}@example.com", "Hi", "<p>Hi</p>")
+
+    async def _batched():
+        # emails not claimed yet are kept in the outbox on close
+        while len(batched) < 3:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(_batched(), 5)
+    await asyncio.wait_for(sender.aclose(), 5)
+
+    assert mailjet.sent == 3
+    assert await outbox.counts() == (0, 0)
+    outbox.close()
+    await batching_sender.client.aclose()
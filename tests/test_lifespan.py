@@ -0,0 +1,43 @@
+from fastapi.testclient import TestClient
+
+from app.modules.users.infrastructure.sqlite_repository import SqliteUserRepository
+from app.modules.users.infrastructure.storage import AbstractUsersStorage
+from app.presentation.api.factory import create_app
+from app.seedwork.infrastructure.email_outbox import EmailOutbox
+
+
+def test_users_journal_is_recovered_on_startup_and_closed_on_shutdown(monkeypatch, tmp_path):
+    journal_dir = tmp_path / "users"
+    monkeypatch.setenv("APP_USERS_JOURNAL_DIR", str(journal_dir))
+    app = create_app()
+
+    with TestClient(app):
+        # before any users request
+        assert journal_dir.exists()
+        storage = app.state.container.resolve(AbstractUsersStorage)
+        assert storage.journal is not None
+
+    assert storage.journal._log is None
+
+
+def test_users_sqlite_pool_is_closed_on_shutdown(monkeypatch):
+    monkeypatch.setenv("APP_USERS_REPOSITORY", "sqlite")
+    app = create_app()
+
+    with TestClient(app) as client:
+        assert client.get("/api/v1/users/").status_code == 200
+        repository = app.state.container.resolve(SqliteUserRepository)
+        assert repository.pool._opened
+
+    assert not repository.pool._opened
+
+
+def test_email_outbox_pool_is_closed_on_shutdown():
+    app = create_app()
+
+    with TestClient(app) as client:
+        outbox = app.state.container.resolve(EmailOutbox)
+        assert client.portal.call(outbox.counts) == (0, 0)
+        assert outbox.pool._opened
+
+    assert not outbox.pool._opened
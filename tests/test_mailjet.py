@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.seedwork.infrastructure.email_sender import EmailNotSent
+from app.seedwork.infrastructure.mailjet import EmailUser, MailjetClient, Message
+
+FROM_USER = EmailUser(email="noreply@example.com")
+
+
+@pytest.mark.asyncio
+async def test_send_email_without_credentials_is_not_sent():
+    client = MailjetClient(("key", ""))
+
+    with pytest.raises(EmailNotSent, match="user@example.com"):
+        await client.send_email(FROM_USER, [EmailUser(email="user@example.com")], "Hi")
+
+
+@pytest.mark.asyncio
+async def test_send_messages_without_credentials_is_not_sent():
+    client = MailjetClient(("", "secret"))
+    messages = [
+        Message(from_user=FROM_USER, to_users=[EmailUser(email=email)], subject="Hi")
+        for email in ("a@example.com", "b@example.com")
+    ]
+
+    with pytest.raises(EmailNotSent) as exc_info:
+        await client.send_messages(messages)
+
+    assert exc_info.value.destination == "a@example.com, b@example.com"
+
+
+def _client(responses: list, **kwargs) -> tuple[MailjetClient, list]:
+    """Client answered with the passed responses or exceptions in turn."""
+    requests = []
+
+    def _handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        response = responses[len(requests) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client = MailjetClient(
+        ("key", "secret"), transport=httpx.MockTransport(_handle), retry_backoff=0, **kwargs
+    )
+    return client, requests
+
+
+async def _send(client: MailjetClient):
+    return await client.send_email(FROM_USER, [EmailUser(email="user@example.com")], "Hi")
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_capped():
+    client, requests = _client(
+        [httpx.Response(429, headers={"Retry-After": "3600"}), httpx.Response(200, json={})],
+        max_retry_delay=0.01,
+    )
+
+    assert await asyncio.wait_for(_send(client), 1) == {}
+    assert len(requests) == 2
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_server_error_is_not_retried():
+    client, requests = _client([httpx.Response(500), httpx.Response(200, json={})])
+
+    assert await _send(client) is False
+    assert len(requests) == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request_not_sent_is_retried():
+    client, requests = _client(
+        [httpx.ConnectError("connection refused"), httpx.Response(200, json={})]
+    )
+
+    assert await _send(client) == {}
+    assert len(requests) == 2
+    await client.aclose()
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.modules.users.domain.commands import CreateUserRequest, CreateUsersBatchRequest, NewUser
+from app.modules.users.domain.queries import GetUsersQuery
+from app.presentation.bootstrap import bootstrap
+from app.seedwork.infrastructure.email_sender import AbstractEmailSender
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_concurrency", [0, -1])
+async def test_send_many_rejects_max_concurrency_below_one(max_concurrency):
+    _, mediator = bootstrap()
+
+    with pytest.raises(ValueError):
+        await mediator.send_many([GetUsersQuery()], max_concurrency=max_concurrency)
+
+
+@pytest.mark.asyncio
+async def test_send_many_returns_results_in_order():
+    _, mediator = bootstrap()
+    for idx in range(3):
+        await mediator.send(CreateUserRequest(email=f"user{idx}@example.com", name="User"))
+
+    results = await mediator.send_many(
+        [GetUsersQuery(limit=limit) for limit in (3, 1, 2)], max_concurrency=2
+    )
+
+    assert [len(result.data) for result in results] == [3, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_users_batch_events_are_emitted_with_bounded_concurrency(monkeypatch):
+    monkeypatch.setenv("APP_EVENTS_CONCURRENT", "true")
+    monkeypatch.setenv("APP_EVENTS_MAX_CONCURRENCY", "2")
+    container, mediator = bootstrap()
+    sent = []
+    sending = 0
+    max_sending = 0
+
+    async def _send(destination: str, subject: str, message: str):
+        nonlocal sending, max_sending
+        sending += 1
+        max_sending = max(max_sending, sending)
+        await asyncio.sleep(0.001)
+        sending -= 1
+        sent.append(destination)
+
+    container.resolve(AbstractEmailSender).send = _send
+
+    await mediator.send(
+        CreateUsersBatchRequest(
+            users=[NewUser(email=f" User{idx}@Example.com", name="User") for idx in range(10)]
+        )
+    )
+
+    assert max_sending == 2
+    assert sorted(sent) == sorted(f"user{idx}@example.com" for idx in range(10))
@@ -0,0 +1,40 @@
+import pytest
+from rodi import Container
+
+from app.modules.users.domain.queries import GetUsersQuery
+from app.modules.users.module import UsersModule
+from app.presentation.bootstrap import bootstrap
+from app.seedwork.application.mediator.cache import QueryCache
+from app.seedwork.infrastructure.metrics import MetricsRegistry
+from app.settings import UsersSettings
+
+
+@pytest.mark.asyncio
+async def test_query_cache_stats_are_exported():
+    container, mediator = bootstrap()
+
+    await mediator.send(GetUsersQuery())
+    await mediator.send(GetUsersQuery())
+
+    exported = container.resolve(MetricsRegistry).export()
+    assert "query_cache_hits_total 1\n" in exported
+    assert "query_cache_misses_total 1\n" in exported
+    assert "query_cache_size 1\n" in exported
+
+
+def test_users_query_is_not_cached_with_shared_sqlite(monkeypatch):
+    monkeypatch.setenv("APP_USERS_REPOSITORY", "sqlite")
+
+    container, _ = bootstrap()
+
+    assert not container.resolve(QueryCache).is_cached(GetUsersQuery)
+
+
+def test_users_query_cache_follows_settings_of_container():
+    container = Container()
+    container.add_instance(UsersSettings(users_repository="sqlite"))
+    query_cache = QueryCache()
+
+    UsersModule().register_query_cache(query_cache, container)
+
+    assert not query_cache.is_cached(GetUsersQuery)
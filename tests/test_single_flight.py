@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from app.modules.users.domain.commands import CreateUserRequest
+from app.modules.users.domain.queries import GetUsersQuery
+from app.modules.users.infrastructure.sqlite_repository import SqliteUserRepository
+from app.presentation.bootstrap import bootstrap
+from app.seedwork.application.mediator.middlewares import MiddlewareChain
+from app.seedwork.application.mediator.single_flight import SingleFlightMiddleware
+from app.seedwork.infrastructure.metrics import MetricsRegistry
+
+
+async def _run_twice(chain: MiddlewareChain, request) -> int:
+    calls = 0
+
+    async def _handle(request):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+
+    handle = chain.wrap(_handle)
+    await asyncio.gather(handle(request), handle(request))
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_equal_registered_queries_are_coalesced():
+    single_flight = SingleFlightMiddleware()
+    single_flight.register(GetUsersQuery)
+    chain = MiddlewareChain()
+    chain.add(single_flight)
+
+    assert await _run_twice(chain, GetUsersQuery()) == 1
+
+
+@pytest.mark.asyncio
+async def test_unregistered_requests_are_not_coalesced_by_wrap():
+    single_flight = SingleFlightMiddleware()
+    single_flight.register(GetUsersQuery)
+    chain = MiddlewareChain()
+    chain.add(single_flight)
+
+    assert await _run_twice(chain, CreateUserRequest(email="a@example.com", name="A")) == 2
+
+
+@pytest.mark.asyncio
+async def test_query_sent_after_command_doesnt_join_query_started_before(monkeypatch):
+    monkeypatch.setenv("APP_USERS_REPOSITORY", "sqlite")
+    container, mediator = bootstrap()
+    repository = container.resolve(SqliteUserRepository)
+    get_page = repository.get_page
+    read = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _get_page(*args, **kwargs):
+        page = await get_page(*args, **kwargs)
+        if not release.is_set():
+            read.set()
+            await release.wait()
+        return page
+
+    repository.get_page = _get_page
+    before = asyncio.create_task(mediator.send(GetUsersQuery()))
+    await read.wait()
+    await mediator.send(CreateUserRequest(email="user@example.com", name="User"))
+    after = asyncio.create_task(mediator.send(GetUsersQuery()))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert (await before).count == 0
+    assert (await after).count == 1
+    repository.pool.close()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_stats_are_exported():
+    container, mediator = bootstrap()
+
+    # the second query misses the cache while the first one is in flight
+    await asyncio.gather(mediator.send(GetUsersQuery()), mediator.send(GetUsersQuery()))
+
+    exported = container.resolve(MetricsRegistry).export()
+    assert "single_flight_calls_total 2\n" in exported
+    assert "single_flight_coalesced_total 1\n" in exported
+    assert "single_flight_in_flight 0\n" in exported
@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+
+import pytest
+
+from app.modules.users.domain.commands import CreateUserRequest
+from app.modules.users.domain.events import UserCreatedEvent
+from app.modules.users.domain.queries import GetUsersQuery
+from app.modules.users.service_layer.event_handlers import UserCreatedEventHandler
+from app.presentation.bootstrap import bootstrap
+from app.seedwork.application.mediator.events.background import BackgroundEventDispatcher
+from app.seedwork.application.mediator.events.event_emitter import EventEmitter
+from app.seedwork.application.mediator.events.map import EventMap
+from app.seedwork.application.mediator.message_brokers import Message, MessageBroker
+from app.seedwork.application.messages import NotificationEvent
+from app.seedwork.infrastructure import tracing
+from app.seedwork.infrastructure.email_sender import AbstractEmailSender
+
+
+@dataclass(frozen=True, kw_only=True)
+class UserChangedEvent(NotificationEvent):
+    changed_user_id: int
+
+
+class CapturingMessageBroker(MessageBroker):
+    def __init__(self) -> None:
+        self.messages: list[Message] = []
+
+    async def send_message(self, message: Message) -> None:
+        self.messages.append(message)
+
+
+@pytest.fixture
+def exporter():
+    exporter = tracing.InMemorySpanExporter()
+    tracing.set_tracer(tracing.Tracer(exporter))
+    yield exporter
+    tracing.set_tracer(tracing.NoopTracer())
+
+
+def _path(spans: list[tracing.Span], name: str) -> list[str]:
+    """Names of the first span with the name and its ancestors, the root first."""
+    by_id = {span.context.span_id: span for span in spans}
+    span = next(span for span in spans if span.name == name)
+    path = [span.name]
+    while span.parent_id is not None:
+        span = by_id[span.parent_id]
+        path.append(span.name)
+    return path[::-1]
+
+
+@pytest.mark.asyncio
+async def test_request_middlewares_and_event_handlers_are_one_trace(exporter):
+    container, mediator = bootstrap()
+
+    async def _send(destination: str, subject: str, message: str):
+        pass
+
+    container.resolve(AbstractEmailSender).send = _send
+
+    await mediator.send(CreateUserRequest(email="user@example.com", name="User"))
+
+    spans = exporter.spans
+    assert len({span.context.trace_id for span in spans}) == 1
+    assert _path(spans, "middleware.LoggingMiddleware") == [
+        "mediator.send",
+        "mediator.dispatch",
+        "middleware.MetricsMiddleware",
+        "middleware.LoggingMiddleware",
+    ]
+    assert _path(spans, "template.render") == ["mediator.send", "event_handler", "template.render"]
+
+
+@pytest.mark.asyncio
+async def test_deferred_event_handler_continues_the_trace_of_the_submitter(exporter):
+    dispatcher = BackgroundEventDispatcher(workers=1)
+    event = UserCreatedEvent(id=1, email="user@example.com", name="User")
+
+    async def _handle(event, handler_type):
+        with tracing.span("handler"):
+            pass
+
+    dispatcher.start()
+    with tracing.span("request"):
+        await dispatcher.submit(event, UserCreatedEventHandler, _handle)
+    await dispatcher.stop()
+
+    request, handler = sorted(exporter.spans, key=lambda span: span.start)
+    assert handler.name == "handler"
+    assert handler.parent_id == request.context.span_id
+    assert handler.context.trace_id == request.context.trace_id
+
+
+@pytest.mark.asyncio
+async def test_message_metadata_carries_the_trace_to_consumers(exporter):
+    broker = CapturingMessageBroker()
+    emitter = EventEmitter(EventMap(), container=None, message_broker=broker)
+
+    await emitter.emit(UserChangedEvent(changed_user_id=1))
+
+    [message] = broker.messages
+    [emit] = exporter.spans
+    parent = tracing.extract(message.metadata)
+    assert (parent.trace_id, parent.span_id) == (emit.context.trace_id, emit.context.span_id)
+    with tracing.span("consumer", parent=parent) as consumer:
+        pass
+    assert consumer.context.trace_id == emit.context.trace_id
+    assert consumer.parent_id == emit.context.span_id
+
+
+def test_extract_without_traceparent_returns_none():
+    assert tracing.extract({}) is None
+    assert tracing.extract({tracing.TRACEPARENT: "garbage"}) is None
+
+
+@pytest.mark.asyncio
+async def test_tracer_installed_after_first_request_records_middleware_spans():
+    _, mediator = bootstrap()
+    await mediator.send(GetUsersQuery())
+    exporter = tracing.InMemorySpanExporter()
+    tracing.set_tracer(tracing.Tracer(exporter))
+    try:
+        await mediator.send(GetUsersQuery(limit=1))
+    finally:
+        tracing.set_tracer(tracing.NoopTracer())
+
+    assert "middleware.CachingMiddleware" in {span.name for span in exporter.spans}
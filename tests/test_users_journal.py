@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from app.modules.users.infrastructure.journal import RECORD_HEADER, UsersJournal
+from app.modules.users.infrastructure.storage import CompactUsersStorage, UsersStorage
+
+
+def _open(directory, storage_cls=UsersStorage, snapshot_every=100_000):
+    storage = storage_cls()
+    journal = UsersJournal(directory, snapshot_every=snapshot_every)
+    journal.recover(storage)
+    storage.journal = journal
+    return storage
+
+
+def _users(storage):
+    return [(user.id, user.email, user.name) for user in storage.search()]
+
+
+@pytest.mark.parametrize("storage_cls", [UsersStorage, CompactUsersStorage])
+def test_users_are_recovered_from_the_log(tmp_path, storage_cls):
+    storage = _open(tmp_path, storage_cls)
+    for idx in range(10):
+        storage.add(f"user{idx}@example.com", f"Użytkownik {idx}")
+    storage.journal.close()
+
+    recovered = _open(tmp_path, storage_cls)
+
+    assert _users(recovered) == _users(storage)
+    assert recovered.last_id == 10
+    assert recovered.add("new@example.com", "New").id == 11
+
+
+def test_torn_record_at_the_end_of_the_log_is_dropped(tmp_path):
+    storage = _open(tmp_path)
+    for idx in range(3):
+        storage.add(f"user{idx}@example.com", f"User {idx}")
+    storage.journal.close()
+    log_path = tmp_path / "users.log"
+    complete_size = log_path.stat().st_size
+    with open(log_path, "ab") as log:
+        # the header of the next record promises more bytes than were written
+        log.write(RECORD_HEADER.pack(4, 20, 10) + b"user3@")
+
+    recovered = _open(tmp_path)
+
+    assert [user_id for user_id, _, _ in _users(recovered)] == [1, 2, 3]
+    assert log_path.stat().st_size == complete_size
+
+    recovered.add("user3@example.com", "User 3")
+    recovered.journal.close()
+    assert _users(_open(tmp_path))[-1] == (4, "user3@example.com", "User 3")
+
+
+def test_log_is_compacted_into_a_snapshot(tmp_path):
+    storage = _open(tmp_path, snapshot_every=10)
+    for idx in range(25):
+        storage.add(f"user{idx}@example.com", f"User {idx}")
+    storage.journal.close()
+
+    assert (tmp_path / "users.snapshot").exists()
+    assert not (tmp_path / "users.log.1").exists()
+
+    recovered = _open(tmp_path, snapshot_every=10)
+
+    assert _users(recovered) == _users(storage)
+
+
+def test_interrupted_compaction_is_finished_on_recovery(tmp_path):
+    storage = _open(tmp_path)
+    for idx in range(5):
+        storage.add(f"user{idx}@example.com", f"User {idx}")
+    storage.journal.close()
+    # the process died after the rotation, before the snapshot was written
+    os.replace(tmp_path / "users.log", tmp_path / "users.log.1")
+
+    recovered = _open(tmp_path)
+
+    assert _users(recovered) == _users(storage)
+    assert (tmp_path / "users.snapshot").exists()
+    assert not (tmp_path / "users.log.1").exists()
+
+
+def test_snapshot_with_unknown_magic_is_rejected(tmp_path):
+    (tmp_path / "users.snapshot").write_bytes(b"NOTASNAPSHOT")
+
+    with pytest.raises(ValueError):
+        _open(tmp_path)